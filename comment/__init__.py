@@ -4,10 +4,12 @@
 from .ant_button import AntButton
 from .datetime_picker import DateTimePicker
 from .countdown_timer import CountdownTimer
+from .filter_combobox import FilterCombobox
 
 __all__ = [
     'AntButton',
     'DateTimePicker',
     'CountdownTimer',
+    'FilterCombobox',
     # 后续添加更多组件时，在这里添加
 ]
\ No newline at end of file
@@ -1,3 +1,4 @@
+import math
 import time
 import tkinter as tk
 from typing import Callable, Optional
@@ -14,21 +15,21 @@ class CountdownTimer:
     - 支持自定义时间格式和回调函数
     """
     
-    def __init__(self, root: tk.Tk, time_var: tk.StringVar, update_interval: int = 100):
+    def __init__(self, root: tk.Tk, time_var: tk.StringVar, update_interval: Optional[int] = None):
         """
         初始化倒计时组件
         
         Args:
             root: Tkinter根窗口对象
             time_var: 用于显示时间的StringVar对象
-            update_interval: 更新间隔（毫秒），默认100ms确保精度
+            update_interval: 固定轮询间隔（毫秒）；默认None表示对齐到每个整秒边界唤醒
         """
         self.root = root
         self.time_var = time_var
         self.update_interval = update_interval
         
         # 倒计时状态
-        self._target_epoch: float = 0.0  # 目标结束时间戳
+        self._deadline: float = 0.0  # 目标结束时刻（time.monotonic 时基，不受系统校时影响）
         self._running: bool = False  # 是否正在运行
         self._current_displayed: int = -1  # 当前显示的秒数
         self._timer_id: Optional[str] = None  # 定时器ID
@@ -37,12 +38,12 @@ class CountdownTimer:
         self._on_finish: Optional[Callable] = None  # 倒计时结束回调
         self._on_update: Optional[Callable[[int], None]] = None  # 每秒更新回调
     
-    def start(self, duration: int, on_finish: Optional[Callable] = None, on_update: Optional[Callable[[int], None]] = None):
+    def start(self, duration: float, on_finish: Optional[Callable] = None, on_update: Optional[Callable[[int], None]] = None):
         """
         开始倒计时
         
         Args:
-            duration: 倒计时时长（秒）
+            duration: 倒计时时长（秒，可带小数）
             on_finish: 倒计时结束时的回调函数
             on_update: 每秒更新时的回调函数
         """
@@ -50,7 +51,7 @@ class CountdownTimer:
         self.stop()
         
         # 设置目标结束时间和回调
-        self._target_epoch = time.time() + duration
+        self._deadline = time.monotonic() + duration
         self._running = True
         self._current_displayed = -1
         self._on_finish = on_finish
@@ -79,7 +80,8 @@ class CountdownTimer:
         """获取当前剩余秒数"""
         if not self._running:
             return 0
-        remaining = max(int(self._target_epoch - time.time()), 0)
+        # 向上取整：还剩 0.3 秒时仍显示 1 秒，与 DamaiGUI._schedule_tick 一致
+        remaining = max(math.ceil(self._deadline - time.monotonic()), 0)
         return remaining
     
     def _tick(self):
@@ -88,8 +90,9 @@ class CountdownTimer:
             return
         
         # 计算剩余时间
-        now = time.time()
-        remaining = max(int(self._target_epoch - now), 0)
+        now = time.monotonic()
+        remaining_f = self._deadline - now
+        remaining = max(math.ceil(remaining_f), 0)
         
         # 更新显示（仅当剩余时间变化时）
         if remaining != self._current_displayed:
@@ -110,5 +113,9 @@ class CountdownTimer:
                 self._on_finish()
             return
         
-        # 继续下一次更新
-        self._timer_id = self.root.after(self.update_interval, self._tick)
\ No newline at end of file
+        # 继续下一次更新：默认休眠到下一个整秒边界，避免无效唤醒
+        if self.update_interval is not None:
+            delay_ms = self.update_interval
+        else:
+            delay_ms = max(int((remaining_f - math.floor(remaining_f)) * 1000), 10)
+        self._timer_id = self.root.after(delay_ms, self._tick)
\ No newline at end of file
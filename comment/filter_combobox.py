@@ -0,0 +1,87 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional, Sequence
+
+
+class FilterCombobox(ttk.Combobox):
+    """
+    支持输入过滤的下拉框，用于候选项很多的场景。
+
+    特性：
+    - 下拉列表最多展示 display_limit 项，避免一次性构建超长列表
+    - 输入文字后按包含关系（不区分大小写）从全部候选项中过滤
+    - 输入框清空时恢复展示前 display_limit 项
+    - 失去焦点时输入内容必须对应某个候选项：唯一匹配时自动补全，否则恢复为上一次的有效值
+    """
+
+    # 不触发过滤的按键（列表导航与确认）
+    _NAVIGATION_KEYS = frozenset(("Up", "Down", "Return", "KP_Enter", "Escape", "Tab"))
+
+    def __init__(self, master: Optional[tk.Misc] = None, *, all_values: Sequence[str] = (),
+                 display_limit: int = 50, **kwargs):
+        """
+        初始化下拉框
+
+        Args:
+            master: 父容器
+            all_values: 全部候选项
+            display_limit: 下拉列表最多展示的候选项数量
+            **kwargs: 传给 ttk.Combobox 的其他参数
+        """
+        super().__init__(master, **kwargs)
+        self.display_limit = display_limit
+        self._all: List[str] = []
+        self._all_lower: List[str] = []
+        self._last_valid = ""
+        self.bind("<KeyRelease>", self._on_key_release, add="+")
+        self.bind("<FocusIn>", self._on_focus_in, add="+")
+        self.bind("<FocusOut>", self._on_focus_out, add="+")
+        self.set_all_values(all_values)
+
+    def set_all_values(self, values: Sequence[str]) -> None:
+        """替换全部候选项，并重置下拉列表为前 display_limit 项"""
+        self._all = list(values)
+        self._all_lower = [value.lower() for value in self._all]
+        self["values"] = self._all[:self.display_limit]
+
+    def _matches(self, query: str) -> List[str]:
+        query = query.strip().lower()
+        return [value for value, lower in zip(self._all, self._all_lower) if query in lower]
+
+    def resolve(self, text: str) -> Optional[str]:
+        """
+        将输入内容解析为候选项
+
+        Returns:
+            与候选项完全一致或唯一包含匹配时返回该候选项，否则返回 None
+        """
+        if text in self._all:
+            return text
+        if not text.strip():
+            return None
+        matches = self._matches(text)
+        return matches[0] if len(matches) == 1 else None
+
+    def _on_focus_in(self, event: tk.Event) -> None:
+        value = self.get()
+        if value in self._all:
+            self._last_valid = value
+
+    def _on_focus_out(self, event: tk.Event) -> None:
+        value = self.resolve(self.get())
+        if value is None:
+            value = self._last_valid
+        else:
+            self._last_valid = value
+        if value != self.get():
+            self.set(value)
+        self["values"] = self._all[:self.display_limit]
+
+    def _on_key_release(self, event: tk.Event) -> None:
+        if event.keysym in self._NAVIGATION_KEYS:
+            return
+        query = self.get().strip().lower()
+        if not query:
+            self["values"] = self._all[:self.display_limit]
+            return
+        self["values"] = self._matches(query)[:self.display_limit]
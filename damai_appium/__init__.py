@@ -12,6 +12,7 @@ from .runner import (
 	TicketRunReport,
 	TicketRunnerError,
 	TicketRunnerStopped,
+	run_runner_process,
 )
 
 __all__ = [
@@ -26,4 +27,5 @@ __all__ = [
 	"TicketRunReport",
 	"TicketRunnerError",
 	"TicketRunnerStopped",
+	"run_runner_process",
 ]
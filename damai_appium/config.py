@@ -425,28 +425,23 @@ def parse_adb_devices(raw_output: str) -> List[AdbDeviceInfo]:
         return devices
 
     for line in raw_output.splitlines():
-        current = line.strip()
-        if not current:
-            continue
-        if current.startswith("List of devices attached"):
+        # split() 本身会忽略首尾空白，空行得到空列表，无需再单独 strip
+        parts = line.split()
+        if not parts:
             continue
-        if current.startswith("*"):
+        serial = parts[0]
+        if serial.startswith("*"):
             # 忽略 adb server 的提示信息
             continue
-
-        parts = current.split()
-        if not parts:
+        if serial == "List" and line.lstrip().startswith("List of devices attached"):
             continue
 
-        serial = parts[0]
         status = parts[1] if len(parts) > 1 else "unknown"
         properties: Dict[str, str] = {}
 
         for token in parts[2:]:
-            if ":" not in token:
-                continue
-            key, value = token.split(":", 1)
-            if key and value:
+            key, sep, value = token.partition(":")
+            if sep and key and value:
                 properties[key] = value
 
         devices.append(AdbDeviceInfo(serial=serial, status=status, properties=properties))
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import pickle
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -1102,4 +1103,43 @@ class DamaiAppTicketRunner:
     def export_last_report(self, path: Union[str, Path], *, indent: int = 2) -> Optional[Path]:
         if self.last_report is None:
             return None
-        return self.last_report.dump_json(path, indent=indent)
\ No newline at end of file
+        return self.last_report.dump_json(path, indent=indent)
+
+
+def _picklable_report(report: Optional[TicketRunReport]) -> Optional[TicketRunReport]:
+    try:
+        pickle.dumps(report)
+    except Exception:  # noqa: BLE001
+        return None
+    return report
+
+
+def run_runner_process(
+    config: AppTicketConfig,
+    max_retries: int,
+    stop_event: Any,
+    events: Any,
+    label: Optional[str] = None,
+) -> None:
+    """Child-process entry point: run the flow and stream events back to the parent.
+
+    ``events`` receives ``("log", level, message, context)`` tuples while running and
+    one final ``("result", success, stopped, report)`` or ``("error", message, report)``.
+    ``stop_event`` is a multiprocessing event set by the parent to request a stop.
+    ``label`` prefixes log messages when several processes share one event queue.
+    """
+
+    prefix = f"[{label}] " if label else ""
+
+    def logger(level: str, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        safe_context = {str(key): str(value) for key, value in (context or {}).items()}
+        events.put(("log", level, prefix + message, safe_context))
+
+    runner: Optional[DamaiAppTicketRunner] = None
+    try:
+        runner = DamaiAppTicketRunner(config=config, logger=logger, stop_signal=stop_event.is_set)
+        success = runner.run(max_retries=max_retries)
+        events.put(("result", success, stop_event.is_set(), _picklable_report(runner.get_last_report())))
+    except Exception as exc:  # noqa: BLE001
+        report = runner.get_last_report() if runner is not None else None
+        events.put(("error", prefix + str(exc), _picklable_report(report)))
@@ -8,22 +8,35 @@ from __future__ import annotations
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
-from comment import DateTimePicker, CountdownTimer
+from comment import DateTimePicker, CountdownTimer, FilterCombobox
 import threading
+import queue
+import socket
 import subprocess
 import sys
 import os
+import hashlib
 import json
+import locale
+import math
+import multiprocessing
 import re
 import time
+import urllib.parse
+import urllib.request
 import webbrowser
 import pickle
 from pathlib import Path
 import importlib.util
 import shutil
-from dataclasses import asdict
-from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, fields
+from functools import lru_cache, partial
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
+from urllib.error import HTTPError
 
 # 确保能够导入selenium等模块
 try:
@@ -36,6 +49,12 @@ try:
 except ImportError:
     SELENIUM_AVAILABLE = False
 
+# 可选：orjson 序列化更快，未安装时回退到标准库 json
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 # 导入App端运行器（如果可用）
 try:
     from damai_appium import (
@@ -45,6 +64,7 @@ try:
         FailureReason,
         LogLevel,
         TicketRunReport,
+        run_runner_process,
     )
     from damai_appium.config import AdbDeviceInfo, parse_adb_devices
 
@@ -56,11 +76,373 @@ except Exception:  # noqa: BLE001
     LogLevel = None  # type: ignore[assignment]
     FailureReason = None  # type: ignore[assignment]
     TicketRunReport = None  # type: ignore[assignment]
+    run_runner_process = None  # type: ignore[assignment]
     AdbDeviceInfo = None  # type: ignore[assignment]
     parse_adb_devices = None  # type: ignore[assignment]
     APPIUM_AVAILABLE = False
 
 
+# 相对当前工作目录查找的默认 App 配置文件与说明文档
+_DEFAULT_APP_CONFIG_CANDIDATES = ("damai_appium/config.jsonc", "damai_appium/config.json")
+_APP_DOC_CANDIDATES = ("damai_appium/app.md", "doc/app.md")
+
+# 主线程轮询后台任务界面更新队列的间隔（毫秒）
+_UI_QUEUE_POLL_MS = 50
+
+# 本机 Appium 服务状态探测：地址、端口连接超时与轮询间隔（秒）
+_APPIUM_STATUS_HOST = "127.0.0.1"
+_APPIUM_STATUS_PORT = 4723
+_APPIUM_CONNECT_TIMEOUT = 0.2
+_APPIUM_STATUS_HTTP_TIMEOUT = 0.3
+_APPIUM_STATUS_URL = f"http://{_APPIUM_STATUS_HOST}:{_APPIUM_STATUS_PORT}/status"
+_APPIUM_STATUS_INTERVAL_IDLE = 0.5
+_APPIUM_STATUS_INTERVAL_RUNNING = 2.0
+_APPIUM_STATUS_INTERVAL_MAX = 5.0
+
+# node/appium/adb 等命令路径查找与版本探测结果的缓存有效期（秒）
+_CLI_CACHE_TTL = 300.0
+
+# 演出页面分析结果的磁盘缓存有效期（秒），期间重复分析同一链接直接使用缓存
+_PAGE_CACHE_TTL = 600.0
+
+# 日志历史最多保留的条数，超出后同时从日志窗口移除最旧的记录
+_LOG_HISTORY_LIMIT = 5000
+
+# 导出日志时每条记录对象的字段名，与 log_entries 迭代出的元组顺序一致
+_LOG_EXPORT_FIELDS = ("timestamp", "message", "level")
+# 导出日志时每累计多少条写一次文件
+_LOG_EXPORT_BATCH = 1024
+
+# 配置文件含多台设备 (devices) 时最多同时运行的抢票子进程数
+_APP_MAX_PARALLEL_DEVICES = 4
+
+# App 运行器日志级别对应的前缀图标，未知级别使用 📄
+_LEVEL_PREFIX = {
+    "step": "🧭",
+    "info": "ℹ️",
+    "success": "✅",
+    "warning": "⚠️",
+    "error": "❌",
+}
+
+# 网页模式配置面板的选择项：(页面信息键, 选中值变量的属性名, 标签文本)
+_WEB_CONFIG_CHOICES: Tuple[Tuple[str, str, str], ...] = (
+    ("cities", "city_var", "🏙️ 选择城市:"),
+    ("dates", "date_var", "📅 选择日期:"),
+    ("prices", "price_var", "💰 选择价格:"),
+)
+
+# 日志级别，同时用作日志文本区域中的标签名
+_LOG_LEVELS = ("info", "success", "warning", "error")
+
+# 按优先级推断日志级别：前缀图标或关键字（英文不区分大小写），均未命中时为 info
+_LOG_LEVEL_PATTERNS: Tuple[Tuple[str, "re.Pattern[str]"], ...] = (
+    ("error", re.compile(r"^❌|错误|fail", re.IGNORECASE)),
+    ("warning", re.compile(r"^⚠️|警告|warning", re.IGNORECASE)),
+    ("success", re.compile(r"^[✅✔]|成功")),
+)
+
+# 四列表单（标签/输入框 × 2）的列权重：仅输入框所在列随窗口伸缩
+_FORM_COLUMN_WEIGHTS = (0, 1, 0, 1)
+
+# 抢票信息表单字段：(表单变量键, 标签文本, 行, 标签所在列)
+_TICKET_FORM_FIELDS: Tuple[Tuple[str, str, int, int], ...] = (
+    ("keyword", "关键词", 0, 0),
+    ("city", "城市", 0, 2),
+    ("session_text", "场次文本", 1, 0),
+    ("session_index", "场次索引", 1, 2),
+    ("price", "票价文本", 2, 0),
+    ("price_index", "票价索引", 2, 2),
+    ("wait_timeout", "等待超时(s)", 3, 0),
+    ("retry_delay", "重试间隔(s)", 3, 2),
+    ("ticket_quantity", "购票数量", 4, 0),
+)
+
+
+# 使用帮助窗口的内容
+_HELP_CONTENT = """
+🎫 大麦抢票工具使用说明
+
+🧭 模式概览：
+• 网页模式 (Web)：使用 Chrome + Selenium 自动化网页端购票流程
+• App 模式 (App)：通过 Appium 控制大麦 App，适合移动端极速抢票
+
+📋 网页模式流程：
+1. 环境检测 —— 检查 Python、Selenium 与 ChromeDriver 是否可用
+2. 网页登录 —— 可选，可提前登录或在抢票时登录，状态会自动保存
+3. 页面分析 —— 输入演出链接，自动解析城市、日期、价格等选项
+4. 参数配置 —— 在界面中选择目标条件并确认
+5. 开始抢票 —— 启动自动化流程，实时输出执行日志
+
+📱 App 模式流程：
+1. 环境检测 —— 校验 Python 环境与 Appium 客户端依赖
+2. 设备检查 —— 请求 Appium Server /status，确认服务与设备在线
+3. 参数配置 —— 选择或加载 config.jsonc/JSON，配置城市、价格、观演人
+4. 开始抢票 —— 运行移动端抢票流程，可设置重试次数
+5. 查看结果 —— 日志中查看 Appium 执行步骤与最终状态
+
+🔧 关键说明：
+
+网页模式：
+• 支持自动保存/加载登录 Cookie，减少重复登录
+• 页面分析无需登录即可完成，可先确认票务信息
+• 勾选「预热浏览器」可提前在后台启动 Chrome，首次登录更快
+• 观演人自动全选，支持可选的自动提交订单
+
+App 模式前置条件：
+• 已安装 Appium Server 并保持运行 (默认 http://127.0.0.1:4723)
+• Android 设备已开启开发者模式并与电脑连接
+• damai_appium/config.jsonc 配置正确，包含 server_url、device_caps 等
+• 若设备未自动识别，请在配置中补充 deviceName、udid 等字段
+
+App 模式小贴士：
+• 先点击“重新加载”确认配置无误，再执行环境检测
+• 环境检测通过后按钮会自动解锁，可随时停止流程
+• 命令行工具检测结果会缓存几分钟；升级 Node.js/Appium/adb 后可按住 Shift 点击“检测环境”强制重新检测
+• 日志前缀：🧭步骤、ℹ️信息、✅成功、⚠️警告、❌异常，便于快速定位
+
+⚠️ 通用注意事项：
+• 确保网络与设备连接稳定
+• 抢票前检查实名信息、观演人等是否完善
+• 谨慎使用自动提交，建议保留人工确认
+• 遵守大麦网条款，合理合法地使用工具
+
+💡 使用技巧：
+• 新用户推荐通过“环境检测”了解依赖情况
+• 自动登录失败时，可清除登录状态后重新登录
+• 多场演出可分别分析并保存日志作为参考
+• 建议在开票前完成一次全流程演练
+"""
+
+
+def _place(widget: tk.Widget, **options: Any) -> None:
+    """直接下发 ``grid configure`` Tcl 命令，跳过 ttk/Grid 包装层的参数整理。"""
+
+    widget.tk.call(("grid", "configure", widget._w) + widget._options(options))
+
+
+def _windows_cli_search_dirs() -> List[Tuple[Path, Tuple[str, ...]]]:
+    """Windows 下 npm 全局目录与 Node.js 安装目录，用于 PATH 未配置时查找命令。"""
+
+    if os.name != "nt":
+        return []
+
+    dirs: List[Tuple[Path, Tuple[str, ...]]] = []
+    appdata = os.environ.get("APPDATA")
+    if appdata:
+        dirs.append((Path(appdata) / "npm", (".cmd", ".exe", "")))
+    for env_name in ("PROGRAMFILES", "PROGRAMFILES(X86)"):
+        program_files = os.environ.get(env_name)
+        if program_files:
+            dirs.append((Path(program_files) / "nodejs", (".exe",)))
+    return dirs
+
+
+def _app_cache_dir() -> Path:
+    """本工具的用户级缓存目录（按平台惯例放在 LOCALAPPDATA / Library/Caches / XDG_CACHE_HOME 下）。"""
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "damai_gui"
+
+
+def _chrome_profile_dir() -> Path:
+    """网页模式 Chrome 的持久化用户目录，登录态、localStorage 与 HTTP 缓存跨次启动保留。"""
+
+    return _app_cache_dir() / "chrome-profile"
+
+
+def _login_marker_path() -> Path:
+    """网页登录成功后写入的标记文件；浏览器用户目录存在不代表已登录，只有该标记存在时才尝试自动登录。"""
+
+    return _app_cache_dir() / "web_login.marker"
+
+
+def _page_cache_path(url: str) -> Path:
+    """演出页面分析结果的缓存文件，按链接的 SHA-1 命名。"""
+
+    return _app_cache_dir() / "page_cache" / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def _load_page_cache(url: str) -> Optional[Dict[str, Any]]:
+    """读取未过期的页面分析结果，不存在、已过期或损坏时返回 None。"""
+
+    try:
+        record = json.loads(_page_cache_path(url).read_bytes())
+        if time.time() - float(record["ts"]) < _PAGE_CACHE_TTL:
+            return record["info"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return None
+
+
+def _store_page_cache(url: str, info: Dict[str, Any]) -> None:
+    """保存页面分析结果，写入失败不影响分析流程。"""
+
+    path = _page_cache_path(url)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(path, {"ts": time.time(), "info": info})
+    except OSError:
+        pass
+
+
+def _build_chrome_options(
+    *, headless: bool = False, persistent_profile: bool = True, eager: bool = False
+) -> Any:
+    """网页模式统一的 ChromeOptions：隐藏自动化特征，并关闭拖慢冷启动、占用内存的后台功能。
+
+    eager 为 True 时 driver.get 在 DOMContentLoaded 后即返回；登录与抢票流程依赖完整加载，
+    只有页面分析专用的浏览器开启。
+    """
+
+    options = webdriver.ChromeOptions()
+    if eager:
+        options.page_load_strategy = "eager"
+    options.add_experimental_option("excludeSwitches", ['enable-automation'])
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 1,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    for argument in (
+        '--disable-blink-features=AutomationControlled',
+        '--disable-extensions',
+        '--disable-background-networking',
+        '--disable-sync',
+        '--disable-default-apps',
+        '--no-first-run',
+        '--no-default-browser-check',
+        '--disable-features=Translate,OptimizationHints',
+    ):
+        options.add_argument(argument)
+    if headless:
+        options.add_argument('--headless')
+    if persistent_profile:
+        options.add_argument(f"--user-data-dir={_chrome_profile_dir()}")
+        options.add_argument("--profile-directory=Default")
+    return options
+
+
+@lru_cache(maxsize=None)
+def _web_chrome_options() -> Any:
+    """共享浏览器使用的 ChromeOptions，参数在进程内固定，只构建一次后复用。"""
+
+    return _build_chrome_options()
+
+
+@lru_cache(maxsize=None)
+def _analysis_chrome_options() -> Any:
+    """页面分析专用浏览器的 ChromeOptions：无界面、临时用户目录、eager 加载策略。"""
+
+    return _build_chrome_options(headless=True, persistent_profile=False, eager=True)
+
+
+def _dump_json_bytes(payload: Any) -> bytes:
+    """序列化为缩进 2 格的 UTF-8 JSON（保留中文原文）。"""
+
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    """先写入同目录临时文件再原子替换，避免写到一半导致配置文件损坏。"""
+
+    _write_bytes_atomic(path, _dump_json_bytes(payload))
+
+
+def _write_bytes_atomic(path: Path, payload: bytes) -> None:
+    """把字节内容写入同目录临时文件后原子替换目标文件。"""
+
+    data = memoryview(payload)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    # 直接写原始文件描述符，不经过 Python 层的缓冲区；Windows 需要 O_BINARY 防止换行被转换
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(str(tmp_path), flags, 0o644)
+    try:
+        while data:
+            written = os.write(fd, data)
+            data = data[written:]
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _dump_json_compact(value: Any) -> bytes:
+    """序列化为单行 UTF-8 JSON（保留中文原文）。"""
+
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+
+def _log_export_header(app_run_report: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """导出日志文件中 ``log_entries`` 之前的各字段。"""
+
+    return {
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+        "app_run_report": app_run_report,
+    }
+
+
+def _log_export_entries(entries: Iterable[Tuple[str, str, str]]) -> Iterator[Dict[str, str]]:
+    """把日志历史元组逐条转为 ``{timestamp, message, level}`` 对象，供流式导出使用。"""
+
+    return (dict(zip(_LOG_EXPORT_FIELDS, entry)) for entry in entries)
+
+
+def _stream_log_export(fp: Any, header: Dict[str, Any], entries: Any) -> None:
+    """写出 ``header`` 各字段后逐批追加 ``log_entries`` 数组，不在内存中拼出完整文档。"""
+
+    # header 逐个字段写出（值为单行 JSON），最后一个字段固定为日志数组
+    buffer = bytearray(b"{")
+    for key, value in header.items():
+        buffer += b"\n  " + _dump_json_compact(str(key)) + b": " + _dump_json_compact(value) + b","
+    buffer += b'\n  "log_entries": ['
+    fp.write(buffer)
+    buffer.clear()
+    separator = b"\n    "
+    for count, entry in enumerate(entries, start=1):
+        buffer += separator
+        buffer += _dump_json_compact(entry)
+        separator = b",\n    "
+        if count % _LOG_EXPORT_BATCH == 0:
+            fp.write(buffer)
+            buffer.clear()
+    if separator != b"\n    ":
+        buffer += b"\n  "
+    buffer += b"]\n}\n"
+    fp.write(buffer)
+
+
+def _fmt_hms(seconds: int) -> str:
+    """把秒数格式化为 ``HH:MM:SS``，超过 24 小时时小时位继续累加。"""
+
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class DeviceRecord(NamedTuple):
+    """一次 adb 刷新得到的可用设备记录。"""
+
+    label: str
+    serial: str
+    model: Optional[str] = None
+    device: Optional[str] = None
+    transport_id: Optional[str] = None
+    properties: Optional[Dict[str, str]] = None
+    info: Any = None
+
+    @property
+    def display_label(self) -> str:
+        return self.label or self.serial or "未知设备"
+
+
 class DamaiGUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -79,6 +461,9 @@ class DamaiGUI:
         
         # 初始化变量
         self.driver = None
+        self._driver_lock = threading.Lock()  # 保护 driver 的复用与创建，避免并发启动多个 Chrome
+        # 页面分析专用的无界面浏览器（eager 加载策略），与共享浏览器分开，由 _driver_lock 一并保护
+        self._analysis_driver = None
         self.target_url = ""
         self.is_grabbing = False  # 抢票状态标志
         self.config = {
@@ -110,21 +495,88 @@ class DamaiGUI:
         self.step_status = []
         self.app_config_data = {}
         self.app_loaded_config = None
+        # App 配置摘要文本框，创建 App 面板后赋值
+        self.app_summary_text: Optional[tk.Text] = None
+        # 配置文件中的 devices 多设备覆盖项（原始映射），运行与保存时原样带上
+        self.app_device_overrides: List[Dict[str, Any]] = []
+        # 已解析的 App 配置缓存：(路径, mtime_ns, 文件大小) -> (AppTicketConfig, devices 覆盖项)
+        self._app_config_cache: Dict[Tuple[str, int, int], Tuple[Any, List[Dict[str, Any]]]] = {}
+        # 默认配置路径探测结果：(探测时的工作目录, 路径)
+        self._default_app_config_path_cache: Optional[Tuple[str, Optional[str]]] = None
+        # 命令行工具路径缓存：命令名 -> (解析出的路径, 写入时的 monotonic 时间)
+        self._cli_path_cache: Dict[str, Tuple[Optional[str], float]] = {}
+        # Windows 下 PATH 之外的候选目录及各自尝试的后缀，启动时读取一次环境变量
+        self._windows_cli_dirs = _windows_cli_search_dirs()
+        # 候选目录的文件列表缓存：目录 -> (写入时的 monotonic 时间, 小写文件名 -> 完整路径)
+        self._cli_dir_listing_cache: Dict[Path, Tuple[float, Dict[str, str]]] = {}
+        # 命令行探测结果缓存：(可执行文件, 参数) -> (写入时的 monotonic 时间, 摘要)，只缓存成功结果
+        self._cli_result_cache: Dict[Tuple[str, Tuple[str, ...]], Tuple[float, str]] = {}
         self.app_env_ready = False
         self.app_config_ready = False
         self.app_should_stop = False
         self.app_detected_devices: List[str] = []
-        self.app_detected_device_records: List[Dict[str, Any]] = []
+        self.app_detected_device_records: List[DeviceRecord] = []
+        self._device_records_by_label: Dict[str, DeviceRecord] = {}  # 按标签索引的设备记录
+        # 设备列表/详情文案缓存，设备记录被替换时清空
+        self._device_list_str_cache: Optional[str] = None
+        self._device_detail_cache: Dict[str, str] = {}
         self._device_refresh_in_progress = False
+        self._env_check_in_progress = False  # 环境检测是否正在后台执行
         self.app_device_status_var: Optional[tk.StringVar] = None
         self.app_device_detail_var: Optional[tk.StringVar] = None
         self.app_device_options_var: Optional[tk.StringVar] = None
         self.app_device_combobox: Optional[ttk.Combobox] = None
-        self.log_entries = []  # type: List[Tuple[str, str, str]]
+        # 日志历史按列存放（时间、内容、级别三个等长队列），省去每条日志一个元组的开销
+        self._log_ts: Deque[str] = deque(maxlen=_LOG_HISTORY_LIMIT)
+        self._log_msg: Deque[str] = deque(maxlen=_LOG_HISTORY_LIMIT)
+        self._log_level: Deque[str] = deque(maxlen=_LOG_HISTORY_LIMIT)
+        self._log_flush_scheduled = False  # 是否已排队一次日志窗口刷新
+        # 批量模式下暂存待插入日志窗口的 (文本, 标签) 序列及需裁剪的行数，None 表示未处于批量模式
+        self._log_batch: Optional[List[Any]] = None
+        self._log_batch_evicted_lines = 0
+        self._last_summary_str = ""  # 摘要文本框当前显示的内容
+        self._last_ts: Tuple[int, str] = (-1, "")  # (整秒, 已格式化的 HH:MM:SS)
+        # 常驻后台线程池与界面更新队列：后台任务把 (函数, 参数) 投递到队列，由主线程定时批量执行
+        self._bg_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="damai-bg")
+        self._ui_queue: "queue.Queue[Tuple[Callable[..., Any], Tuple[Any, ...]]]" = queue.Queue()
+        # 后台线程写日志的回调，只绑定一次，供各工作线程与页面分析/抢票模块共用
+        self._log_from_thread: Callable[[str], None] = partial(self._post_to_ui, self.log)
+        # 网页模式的登录/分析/抢票任务共用一个常驻线程，同一时间只允许一个任务运行
+        self._web_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="damai-web")
+        self._active_future: Optional[Future] = None
+        self._web_stop_event = threading.Event()  # 网页模式抢票循环的停止信号
+        # 是否提前在后台启动共享浏览器（默认关闭，由网页模式面板中的勾选框开启）
+        self.prewarm_browser_var = tk.BooleanVar(value=False)
         self._last_config_errors: List[str] = []
         self.last_app_report = None
         self.log_filter_var = tk.StringVar(value="全部")
         self.app_runner_thread: Optional[threading.Thread] = None
+        # 子进程抢票的停止事件，仅在子进程运行期间存在
+        self._app_stop_event: Optional[Any] = None
+        self.login_btn: Optional[ttk.Button] = None
+        self.analyze_btn: Optional[ttk.Button] = None
+        self.start_btn: Optional[ttk.Button] = None
+        self.stop_btn: Optional[ttk.Button] = None
+        self.env_status_label: Optional[ttk.Label] = None
+        self.appium_toggle_btn: Optional[ttk.Button] = None
+        self.app_device_refresh_btn: Optional[ttk.Button] = None
+        self.app_device_status_label: Optional[ttk.Label] = None
+        self.app_device_detail_label: Optional[ttk.Label] = None
+        self.app_runner: Optional[Any] = None
+        # 定时抢票倒计时状态
+        self._schedule_running = False
+        self._schedule_monotonic_deadline = 0.0  # time.monotonic 时基的开抢时刻
+        self._preheat_executed = False
+        self._current_displayed_time = -1  # 初始值设为-1，确保第一次能更新
+        self._collapsible_controls: List[Tuple[ttk.Button, ttk.Frame]] = []
+        self._help_window: Optional[tk.Toplevel] = None  # 使用帮助窗口，首次打开时创建
+        # 网页模式当前页面各选择项的选中值变量，页面没有该选择项时为 None
+        self.city_var: Optional[tk.StringVar] = None
+        self.date_var: Optional[tk.StringVar] = None
+        self.price_var: Optional[tk.StringVar] = None
+        # 网页模式配置面板的选择控件，按页面信息键保存 (标签, 下拉框, 变量)，首次分析后创建
+        self._config_widgets: Optional[Dict[str, Tuple[ttk.Label, FilterCombobox, tk.StringVar]]] = None
+        self._suspend_form_trace = False  # 批量回填表单时暂停变量 trace 触发的校验
         self._init_app_form_vars()
         self.app_metrics_var = tk.StringVar(value="尚未运行 App 抢票流程")
         # Appium 服务器启动/停止控制状态
@@ -132,16 +584,20 @@ class DamaiGUI:
         self.appium_pid: Optional[int] = None
         self.appium_running = False
         self.appium_status_var = tk.StringVar(value="Appium 未运行")
+        # 当前显示的 (状态文字, 按钮文案)，未变化时跳过 Tk 更新
+        self._last_appium_display: Tuple[str, str] = ("Appium 未运行", "🚀 启动 Appium")
         
         # 定时抢票相关变量
         self.schedule_warmup_var = tk.IntVar(value=120)
+        # 倒计时每秒都要读取预热秒数，解析结果缓存起来，变量被修改时再失效
+        self._warmup_cache: Optional[int] = None
+        self.schedule_warmup_var.trace_add("write", self._invalidate_warmup_cache)
         self.schedule_status_var = tk.StringVar(value="未预约")
         # 初始化新的倒计时组件
         self.countdown_timer = CountdownTimer(self.root, self.schedule_status_var)
         
         # Cookie管理
         self.cookie_file = "damai_cookies.pkl"
-        self.last_cookie_save = time.time()  # 记录上次保存cookie的时间
         
         # 设置字体 - 增加两个号
         self.default_font = ("微软雅黑", 12)  # 从10增加到12
@@ -182,56 +638,44 @@ class DamaiGUI:
         
         # 自动加载默认配置
         self._setup_auto_config_load()
+
+        # 启动后台任务结果的界面泵
+        self.root.after(_UI_QUEUE_POLL_MS, self._drain_bg_queue)
+
         
         # 初始环境检测
         if not SELENIUM_AVAILABLE:
             self.log("⚠️ 警告：selenium模块未安装，部分功能可能无法使用")
         
-        # 添加Appium状态检测
-        self._appium_status_check_interval = 2000  # 2秒检测一次
-        self._appium_status_timer_id = None
-        self._check_appium_status()  # 立即执行一次状态检查
-        self._start_appium_status_check()
-    
-    def save_cookies(self):
-        """保存当前浏览器的cookies到文件"""
-        try:
-            if self.driver:
-                cookies = self.driver.get_cookies()
-                with open(self.cookie_file, 'wb') as f:
-                    pickle.dump(cookies, f)
-                self.last_cookie_save = time.time()  # 更新保存时间
-                self.log("✅ Cookie已保存，下次启动时将自动登录")
-                return True
-        except Exception as e:
-            self.log(f"❌ Cookie保存失败: {e}")
-        return False
-    
-    def auto_save_cookies_if_needed(self):
-        """如果需要，自动保存cookies（每5分钟保存一次）"""
-        try:
-            current_time = time.time()
-            # 如果距离上次保存超过5分钟，就自动保存
-            if self.driver and (current_time - self.last_cookie_save > 300):  # 300秒 = 5分钟
-                if self.save_cookies():
-                    self.log("🔄 自动保存Cookie（定期保存）")
-        except Exception as e:
-            self.log(f"⚠️ 自动保存Cookie失败: {e}")
-        
-        # 设置下次检查（30秒后）
-        self.root.after(30000, self.auto_save_cookies_if_needed)
+        # 添加Appium状态检测：后台守护线程探测端口，结果投递回主线程
+        self._appium_status_wake = threading.Event()
+        threading.Thread(
+            target=self._appium_status_loop,
+            name="damai-appium-status",
+            daemon=True,
+        ).start()
     
     def load_cookies(self):
-        """从文件加载cookies到浏览器"""
+        """恢复登录状态：优先使用浏览器用户目录中的会话，其次导入旧版Cookie文件"""
         try:
-            if os.path.exists(self.cookie_file) and self.driver:
+            if not self.driver:
+                return False
+
+            profile_session = _login_marker_path().exists()
+            legacy_cookies = os.path.exists(self.cookie_file)
+            if not (profile_session or legacy_cookies):
+                return False
+
+            # 先访问大麦网主页，用户目录中保存的会话会直接生效；导入Cookie也需要先处于该域名下
+            self.driver.get("https://www.damai.cn")
+            if profile_session and self._wait_for_login():
+                self.log("✅ 自动登录成功，使用浏览器保存的登录状态")
+                return True
+
+            if legacy_cookies:
                 with open(self.cookie_file, 'rb') as f:
                     cookies = pickle.load(f)
                 
-                # 先访问大麦网主页
-                self.driver.get("https://www.damai.cn")
-                time.sleep(2)
-                
                 # 添加所有cookies
                 for cookie in cookies:
                     try:
@@ -242,10 +686,10 @@ class DamaiGUI:
                 
                 # 刷新页面使cookies生效
                 self.driver.refresh()
-                time.sleep(2)
                 
                 # 检查是否登录成功
-                if self.check_login_status():
+                if self._wait_for_login():
+                    self._mark_login_saved()
                     self.log("✅ 自动登录成功，使用已保存的登录状态")
                     return True
                 else:
@@ -289,21 +733,96 @@ class DamaiGUI:
         except Exception as e:
             self.log(f"登录状态检查失败: {e}")
             return False
+
+    def _wait_for_login(self, timeout: float = 2.0) -> bool:
+        """轮询登录状态，已登录时立即返回，最多等待 timeout 秒"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(
+                lambda _driver: self.check_login_status()
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    @staticmethod
+    def _mark_login_saved() -> None:
+        """记录浏览器用户目录中已保存登录会话，下次启动据此自动登录"""
+        try:
+            marker = _login_marker_path()
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.touch()
+        except OSError:
+            pass
     
     def clear_cookies(self):
         """清除保存的cookies"""
         try:
+            _login_marker_path().unlink(missing_ok=True)
             if os.path.exists(self.cookie_file):
                 os.remove(self.cookie_file)
                 self.log("✅ Cookie已清除")
             if self.driver:
                 self.driver.delete_all_cookies()
+            else:
+                shutil.rmtree(_chrome_profile_dir(), ignore_errors=True)
         except Exception as e:
             self.log(f"Cookie清除失败: {e}")
             
+    def _post_to_ui(self, func: Callable[..., Any], *args: Any) -> None:
+        """从后台线程投递一次界面更新，由 _drain_bg_queue 在主线程执行。"""
+
+        self._ui_queue.put((func, args))
+
+    def _drain_bg_queue(self) -> None:
+        """批量执行后台线程投递的界面更新，并安排下一次轮询。"""
+
+        self.root.after(_UI_QUEUE_POLL_MS, self._drain_bg_queue)
+        if self._ui_queue.empty():
+            return
+        # 同一批投递产生的日志合并为一次写入
+        with self._with_batched_ui_updates():
+            while True:
+                try:
+                    func, args = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    return
+                func(*args)
+
+    def _web_task_busy(self) -> bool:
+        """网页模式上一个后台任务是否仍在运行，运行中时提示用户稍候"""
+        if self._active_future is not None and not self._active_future.done():
+            self.log("⚠️ 上一个浏览器任务仍在执行，请稍候再试")
+            return True
+        return False
+
+    def _submit_web_task(self, worker: Callable[..., Any], *args: Any) -> None:
+        """把网页模式任务交给常驻线程执行"""
+        self._active_future = self._web_pool.submit(worker, *args)
+
     def run(self):
         """启动GUI"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # 窗口关闭后通知抢票循环退出，并释放常驻线程池（不等待正在运行的任务）
+            self.is_grabbing = False
+            self._web_stop_event.set()
+            self._web_pool.shutdown(wait=False)
+            self._bg_pool.shutdown(wait=False)
+            self._quit_driver()
+
+    def _quit_driver(self) -> None:
+        """退出共享浏览器、页面分析浏览器及其 chromedriver 进程"""
+        with self._driver_lock:
+            drivers = (self.driver, self._analysis_driver)
+            self.driver = self._analysis_driver = None
+            for driver in drivers:
+                if driver is None:
+                    continue
+                try:
+                    driver.quit()
+                except Exception:  # noqa: BLE001
+                    pass
         
     def create_interface(self):
         """创建主界面"""
@@ -407,6 +926,8 @@ class DamaiGUI:
         
         self.check_env_btn = ttk.Button(env_container, text="🔍 检测环境", command=self.check_environment)
         self.check_env_btn.grid(row=0, column=1, sticky="w", pady=2)
+        # 按住 Shift 点击时强制重新探测 Node.js / Appium / adb，不复用缓存结果
+        self.check_env_btn.bind("<Shift-Button-1>", self._on_force_check_environment)
 
         # 模式面板容器
         self.mode_notebook = ttk.Notebook(left_frame, style="Modern.TNotebook")
@@ -480,9 +1001,6 @@ class DamaiGUI:
         self.log("💡 提示：请先检测环境，然后根据模式完成参数配置")
         self.log("ℹ️ 登录为可选项，可在抢票时再进行登录")
         
-        # 启动定期保存cookie功能
-        self.root.after(30000, self.auto_save_cookies_if_needed)  # 30秒后开始第一次检查
-
         # 启动后台授权复检（被吊销时立即退出）
         try:
             self._start_authz_watchdog()
@@ -522,6 +1040,13 @@ class DamaiGUI:
         )
         self.analyze_btn.pack(side="left")
 
+        ttk.Checkbutton(
+            url_buttons_frame,
+            text="🔥 预热浏览器",
+            variable=self.prewarm_browser_var,
+            command=self._prewarm_browser,
+        ).pack(side="left", padx=(10, 0))
+
         # 抢票配置区域
         config_frame = ttk.LabelFrame(container, text="抢票配置", padding="5")
         config_frame.pack(fill="x", pady=(0, 10))
@@ -816,130 +1341,114 @@ class DamaiGUI:
             font=self.default_font,
         )
         self.app_summary_text.pack(fill="both", expand=True)
-        self.app_summary_text.insert(tk.END, "请在左侧表单填写 Appium 配置，完成后将在此展示摘要。")
-        self.app_summary_text.config(state="disabled")
+        self._render_app_summary("请在左侧表单填写 Appium 配置，完成后将在此展示摘要。")
 
     def _create_app_form_fields(self, container: ttk.LabelFrame) -> None:
         """创建 App 模式基础配置表单（分隔设备信息与抢票信息）"""
-    
+
+        Label, Entry, Checkbutton = ttk.Label, ttk.Entry, ttk.Checkbutton
+
+        # 先创建全部控件，再统一一次性交给 grid 布局，减少逐个 .grid() 的包装开销
+        placements: List[Tuple[tk.Widget, Dict[str, Any]]] = []
+
+        def _add_entry(
+            frame: ttk.LabelFrame,
+            key: str,
+            text: str,
+            row: int,
+            column: int,
+            *,
+            width: int = 24,
+            columnspan: int = 1,
+        ) -> None:
+            label = Label(frame, text=text)
+            entry = Entry(frame, textvariable=self.app_form_vars[key], width=width)
+            placements.append((label, {"row": row, "column": column, "sticky": "w", "pady": 2}))
+            placements.append(
+                (
+                    entry,
+                    {
+                        "row": row,
+                        "column": column + 1,
+                        "columnspan": columnspan,
+                        "sticky": "we",
+                        "padx": (5, 0),
+                        "pady": 2,
+                    },
+                )
+            )
+            self.app_form_entries[key] = entry
+
         # 设备信息分组
         device_frame = ttk.LabelFrame(container, text="设备信息", padding="6")
         device_frame.pack(fill="x", pady=(0, 8))
-        for col in range(4):
-            device_frame.columnconfigure(col, weight=1 if col in (1, 3) else 0)
-    
-        ttk.Label(device_frame, text="Appium 服务地址").grid(row=0, column=0, sticky="w", pady=2)
-        server_entry = ttk.Entry(device_frame, textvariable=self.app_form_vars["server_url"], width=35)
-        server_entry.grid(row=0, column=1, columnspan=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["server_url"] = server_entry
-    
-        ttk.Label(device_frame, text="设备名称").grid(row=1, column=0, sticky="w", pady=2)
-        device_entry = ttk.Entry(device_frame, textvariable=self.app_form_vars["device_name"], width=24)
-        device_entry.grid(row=1, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["device_name"] = device_entry
-    
-        ttk.Label(device_frame, text="设备 UDID").grid(row=1, column=2, sticky="w", pady=2)
-        udid_entry = ttk.Entry(device_frame, textvariable=self.app_form_vars["udid"], width=24)
-        udid_entry.grid(row=1, column=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["udid"] = udid_entry
-    
+        for col, weight in enumerate(_FORM_COLUMN_WEIGHTS):
+            device_frame.columnconfigure(col, weight=weight)
+
+        _add_entry(device_frame, "server_url", "Appium 服务地址", 0, 0, width=35, columnspan=3)
+        _add_entry(device_frame, "device_name", "设备名称", 1, 0)
+        _add_entry(device_frame, "udid", "设备 UDID", 1, 2)
+
         # 抢票信息分组
         ticket_frame = ttk.LabelFrame(container, text="抢票信息", padding="6")
         ticket_frame.pack(fill="x", pady=(0, 8))
-        for col in range(4):
-            ticket_frame.columnconfigure(col, weight=1 if col in (1, 3) else 0)
-    
-        ttk.Label(ticket_frame, text="关键词").grid(row=0, column=0, sticky="w", pady=2)
-        keyword_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["keyword"], width=24)
-        keyword_entry.grid(row=0, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["keyword"] = keyword_entry
-    
-        ttk.Label(ticket_frame, text="城市").grid(row=0, column=2, sticky="w", pady=2)
-        city_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["city"], width=24)
-        city_entry.grid(row=0, column=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["city"] = city_entry
-    
-        ttk.Label(ticket_frame, text="场次文本").grid(row=1, column=0, sticky="w", pady=2)
-        session_text_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["session_text"], width=24)
-        session_text_entry.grid(row=1, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["session_text"] = session_text_entry
-    
-        ttk.Label(ticket_frame, text="场次索引").grid(row=1, column=2, sticky="w", pady=2)
-        session_index_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["session_index"], width=24)
-        session_index_entry.grid(row=1, column=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["session_index"] = session_index_entry
-    
-        ttk.Label(ticket_frame, text="票价文本").grid(row=2, column=0, sticky="w", pady=2)
-        price_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["price"], width=24)
-        price_entry.grid(row=2, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["price"] = price_entry
-    
-        ttk.Label(ticket_frame, text="票价索引").grid(row=2, column=2, sticky="w", pady=2)
-        price_index_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["price_index"], width=24)
-        price_index_entry.grid(row=2, column=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["price_index"] = price_index_entry
-    
-        ttk.Label(ticket_frame, text="等待超时(s)").grid(row=3, column=0, sticky="w", pady=2)
-        wait_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["wait_timeout"], width=24)
-        wait_entry.grid(row=3, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["wait_timeout"] = wait_entry
-    
-        ttk.Label(ticket_frame, text="重试间隔(s)").grid(row=3, column=2, sticky="w", pady=2)
-        retry_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["retry_delay"], width=24)
-        retry_entry.grid(row=3, column=3, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["retry_delay"] = retry_entry
+        for col, weight in enumerate(_FORM_COLUMN_WEIGHTS):
+            ticket_frame.columnconfigure(col, weight=weight)
 
-        # 购票数量
-        ttk.Label(ticket_frame, text="购票数量").grid(row=4, column=0, sticky="w", pady=2)
-        ticket_quantity_entry = ttk.Entry(ticket_frame, textvariable=self.app_form_vars["ticket_quantity"], width=24)
-        ticket_quantity_entry.grid(row=4, column=1, sticky="we", padx=(5, 0), pady=2)
-        self.app_form_entries["ticket_quantity"] = ticket_quantity_entry
+        for key, text, row, column in _TICKET_FORM_FIELDS:
+            _add_entry(ticket_frame, key, text, row, column)
 
         # 自动提交订单开关（从高级选项迁移到抢票信息分组）
-        ttk.Label(ticket_frame, text="自动提交订单").grid(row=5, column=0, sticky="w", pady=2)
-        commit_check = ttk.Checkbutton(
+        commit_label = Label(ticket_frame, text="自动提交订单")
+        commit_check = Checkbutton(
             ticket_frame,
             text="完成下单流程后自动提交",
             variable=self.app_form_vars["if_commit_order"],
             onvalue=True,
             offvalue=False,
         )
-        commit_check.grid(row=5, column=1, columnspan=3, sticky="w", pady=2)
         self.app_form_entries["if_commit_order"] = commit_check
+        placements.append((commit_label, {"row": 5, "column": 0, "sticky": "w", "pady": 2}))
+        placements.append((commit_check, {"row": 5, "column": 1, "columnspan": 3, "sticky": "w", "pady": 2}))
 
-        viewers_note = ttk.Label(ticket_frame, text="观演人：默认全选，无需填写", foreground="gray")
-        viewers_note.grid(row=6, column=0, columnspan=4, sticky="w", pady=(2, 0))
+        viewers_note = Label(ticket_frame, text="观演人：默认全选，无需填写", foreground="gray")
+        placements.append((viewers_note, {"row": 6, "column": 0, "columnspan": 4, "sticky": "w", "pady": (2, 0)}))
+
+        for widget, options in placements:
+            _place(widget, **options)
 
         self._update_app_summary_from_form()
 
     def _create_app_advanced_fields(self, container: ttk.Frame) -> None:
         """创建 App 模式高级配置字段"""
 
+        Label, Entry, Checkbutton = ttk.Label, ttk.Entry, ttk.Checkbutton
+
         container.columnconfigure(1, weight=1)
         container.columnconfigure(3, weight=1)
 
-        ttk.Label(container, text="AutomationName").grid(row=0, column=0, sticky="w", pady=2)
-        auto_entry = ttk.Entry(container, textvariable=self.app_form_vars["automation_name"], width=24)
+        Label(container, text="AutomationName").grid(row=0, column=0, sticky="w", pady=2)
+        auto_entry = Entry(container, textvariable=self.app_form_vars["automation_name"], width=24)
         auto_entry.grid(row=0, column=1, sticky="we", padx=(5, 0), pady=2)
         self.app_form_entries["automation_name"] = auto_entry
 
-        ttk.Label(container, text="票价索引").grid(row=0, column=2, sticky="w", pady=2)
-        price_index_entry = ttk.Entry(container, textvariable=self.app_form_vars["price_index"], width=24)
+        Label(container, text="票价索引").grid(row=0, column=2, sticky="w", pady=2)
+        price_index_entry = Entry(container, textvariable=self.app_form_vars["price_index"], width=24)
         price_index_entry.grid(row=0, column=3, sticky="we", padx=(5, 0), pady=2)
         self.app_form_entries["price_index"] = price_index_entry
 
-        ttk.Label(container, text="等待超时(s)").grid(row=1, column=0, sticky="w", pady=2)
-        wait_entry = ttk.Entry(container, textvariable=self.app_form_vars["wait_timeout"], width=24)
+        Label(container, text="等待超时(s)").grid(row=1, column=0, sticky="w", pady=2)
+        wait_entry = Entry(container, textvariable=self.app_form_vars["wait_timeout"], width=24)
         wait_entry.grid(row=1, column=1, sticky="we", padx=(5, 0), pady=2)
         self.app_form_entries["wait_timeout"] = wait_entry
 
-        ttk.Label(container, text="重试间隔(s)").grid(row=1, column=2, sticky="w", pady=2)
-        retry_entry = ttk.Entry(container, textvariable=self.app_form_vars["retry_delay"], width=24)
+        Label(container, text="重试间隔(s)").grid(row=1, column=2, sticky="w", pady=2)
+        retry_entry = Entry(container, textvariable=self.app_form_vars["retry_delay"], width=24)
         retry_entry.grid(row=1, column=3, sticky="we", padx=(5, 0), pady=2)
         self.app_form_entries["retry_delay"] = retry_entry
 
-        ttk.Label(container, text="自动提交订单").grid(row=2, column=0, sticky="w", pady=2)
-        commit_check = ttk.Checkbutton(
+        Label(container, text="自动提交订单").grid(row=2, column=0, sticky="w", pady=2)
+        commit_check = Checkbutton(
             container,
             text="完成下单流程后自动提交",
             variable=self.app_form_vars["if_commit_order"],
@@ -949,7 +1458,7 @@ class DamaiGUI:
         commit_check.grid(row=2, column=1, columnspan=3, sticky="w", pady=2)
         self.app_form_entries["if_commit_order"] = commit_check
 
-        ttk.Label(
+        Label(
             container,
             text="如需保留默认行为，可不用修改此处配置。",
             foreground="gray",
@@ -1015,8 +1524,6 @@ class DamaiGUI:
         toggle_btn.bind("<Return>", lambda _event: _toggle())
         toggle_btn.bind("<space>", lambda _event: _toggle())
 
-        if not hasattr(self, "_collapsible_controls"):
-            self._collapsible_controls: list[tuple[ttk.Button, ttk.Frame]] = []
         self._collapsible_controls.append((toggle_btn, body))
 
         return content_frame
@@ -1312,12 +1819,26 @@ class DamaiGUI:
         self._on_app_form_changed()
 
     def _on_app_form_changed(self, *_args: Any) -> None:
-        self.app_config_ready = self._validate_app_form()
-        self._update_app_summary_from_form()
+        if self._suspend_form_trace:
+            return
+        self.app_config_ready = self._revalidate_and_summarize()
         self._refresh_app_start_button()
 
+    def _revalidate_and_summarize(self, update_label: bool = True) -> bool:
+        """校验表单并刷新摘要，两者共用同一次配置解析结果。"""
+
+        if AppTicketConfig is None:
+            self._update_app_summary_from_form()
+            return False
+
+        config = self._collect_app_config_from_form(strict=False)
+        ready = self._apply_form_status(config, update_label=update_label)
+        if self.app_summary_text is not None:
+            self._set_app_summary_text(config)
+        return ready
+
     def _refresh_app_start_button(self) -> None:
-        if not hasattr(self, "start_btn"):
+        if self.start_btn is None:
             return
         if self.mode_var.get() != "app":
             return
@@ -1326,6 +1847,11 @@ class DamaiGUI:
 
     def _validate_app_form(self, update_label: bool = True) -> bool:
         config = self._collect_app_config_from_form(strict=False)
+        return self._apply_form_status(config, update_label=update_label)
+
+    def _apply_form_status(self, config: Optional[Any], *, update_label: bool = True) -> bool:
+        """根据解析结果更新表单状态标签，返回配置是否就绪。"""
+
         errors = list(self._last_config_errors)
 
         ready = config is not None and not errors
@@ -1352,14 +1878,11 @@ class DamaiGUI:
         return ready
 
     def _update_app_summary_from_form(self) -> None:
-        if not hasattr(self, "app_summary_text"):
+        if self.app_summary_text is None:
             return
 
         if AppTicketConfig is None:
-            self.app_summary_text.config(state="normal")
-            self.app_summary_text.delete("1.0", tk.END)
-            self.app_summary_text.insert(tk.END, "当前环境未启用 Appium，请先安装相关依赖。")
-            self.app_summary_text.config(state="disabled")
+            self._render_app_summary("当前环境未启用 Appium，请先安装相关依赖。")
             return
 
         config = self._collect_app_config_from_form(strict=False)
@@ -1369,65 +1892,69 @@ class DamaiGUI:
         if not config:
             return
 
-        self.app_form_vars["server_url"].set(getattr(config, "server_url", ""))
-        self.app_form_vars["keyword"].set(getattr(config, "keyword", "") or "")
-        self.app_form_vars["city"].set(getattr(config, "city", "") or "")
-        self.app_form_vars["date"].set(getattr(config, "date", "") or "")
-        self.app_form_vars["session_text"].set(getattr(config, "session_text", "") or "")
-        self.app_form_vars["price"].set(getattr(config, "price", "") or "")
-
-        session_index = getattr(config, "session_index", None)
-        self.app_form_vars["session_index"].set("" if session_index is None else str(session_index))
-
-        price_index = getattr(config, "price_index", None)
-        self.app_form_vars["price_index"].set("" if price_index is None else str(price_index))
-
-        ticket_quantity = getattr(config, "ticket_quantity", None)
-        self.app_form_vars["ticket_quantity"].set("" if ticket_quantity is None else str(ticket_quantity))
-
-        self.app_form_vars["wait_timeout"].set(str(getattr(config, "wait_timeout", 2.0)))
-        self.app_form_vars["retry_delay"].set(str(getattr(config, "retry_delay", 2.0)))
-        self.app_form_vars["if_commit_order"].set(bool(getattr(config, "if_commit_order", True)))
-
-        device_caps = getattr(config, "device_caps", {}) or {}
-        self.app_form_vars["device_name"].set(device_caps.get("deviceName", ""))
-        self.app_form_vars["platform_version"].set(device_caps.get("platformVersion", ""))
-        self.app_form_vars["udid"].set(device_caps.get("udid", ""))
-        
-        # 加载开抢时间配置
-        event_date = getattr(config, "date", "")
-        if event_date and hasattr(self, 'schedule_datetime_picker'):
-            # 如果配置文件中有日期字段，设置为默认开抢日期
-            try:
-                # 解析日期字符串为datetime对象
+        # 逐个 set() 会反复触发 trace 校验，回填期间暂停，结束后统一校验一次
+        self._suspend_form_trace = True
+        try:
+            self.app_form_vars["server_url"].set(getattr(config, "server_url", ""))
+            self.app_form_vars["keyword"].set(getattr(config, "keyword", "") or "")
+            self.app_form_vars["city"].set(getattr(config, "city", "") or "")
+            self.app_form_vars["date"].set(getattr(config, "date", "") or "")
+            self.app_form_vars["session_text"].set(getattr(config, "session_text", "") or "")
+            self.app_form_vars["price"].set(getattr(config, "price", "") or "")
+
+            session_index = getattr(config, "session_index", None)
+            self.app_form_vars["session_index"].set("" if session_index is None else str(session_index))
+
+            price_index = getattr(config, "price_index", None)
+            self.app_form_vars["price_index"].set("" if price_index is None else str(price_index))
+
+            ticket_quantity = getattr(config, "ticket_quantity", None)
+            self.app_form_vars["ticket_quantity"].set("" if ticket_quantity is None else str(ticket_quantity))
+
+            self.app_form_vars["wait_timeout"].set(str(getattr(config, "wait_timeout", 2.0)))
+            self.app_form_vars["retry_delay"].set(str(getattr(config, "retry_delay", 2.0)))
+            self.app_form_vars["if_commit_order"].set(bool(getattr(config, "if_commit_order", True)))
+
+            device_caps = getattr(config, "device_caps", {}) or {}
+            self.app_form_vars["device_name"].set(device_caps.get("deviceName", ""))
+            self.app_form_vars["platform_version"].set(device_caps.get("platformVersion", ""))
+            self.app_form_vars["udid"].set(device_caps.get("udid", ""))
+
+            # 加载开抢时间配置
+            event_date = getattr(config, "date", "")
+            if event_date and hasattr(self, 'schedule_datetime_picker'):
+                # 如果配置文件中有日期字段，设置为默认开抢日期
+                try:
+                    # 解析日期字符串为datetime对象
                 
-                # 尝试不同的日期格式
-                date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"]
-                for fmt in date_formats:
-                    try:
-                        dt = datetime.strptime(event_date, fmt)
-                        # 使用DateTimePicker的方法来设置日期时间
-                        self.schedule_datetime_picker.selected_datetime = dt
-                        self.schedule_datetime_picker.update_display(dt)
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                # 如果解析失败，忽略该配置
-                pass
-        self.app_form_vars["automation_name"].set(device_caps.get("automationName", ""))
-
-        # 加载预热秒数配置
-        warmup_sec = getattr(config, "warmup_sec", None)
-        if warmup_sec is not None:
-            self.schedule_warmup_var.set(warmup_sec)
-
-        if self.app_users_text is not None:
-            self.app_users_text.delete("1.0", tk.END)
-            users = getattr(config, "users", []) or []
-            if users:
-                self.app_users_text.insert(tk.END, "\n".join(users))
-
+                    # 尝试不同的日期格式
+                    date_formats = ["%Y-%m-%d", "%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"]
+                    for fmt in date_formats:
+                        try:
+                            dt = datetime.strptime(event_date, fmt)
+                            # 使用DateTimePicker的方法来设置日期时间
+                            self.schedule_datetime_picker.selected_datetime = dt
+                            self.schedule_datetime_picker.update_display(dt)
+                            break
+                        except ValueError:
+                            continue
+                except Exception:
+                    # 如果解析失败，忽略该配置
+                    pass
+            self.app_form_vars["automation_name"].set(device_caps.get("automationName", ""))
+
+            # 加载预热秒数配置
+            warmup_sec = getattr(config, "warmup_sec", None)
+            if warmup_sec is not None:
+                self.schedule_warmup_var.set(warmup_sec)
+
+            if self.app_users_text is not None:
+                self.app_users_text.delete("1.0", tk.END)
+                users = getattr(config, "users", []) or []
+                if users:
+                    self.app_users_text.insert(tk.END, "\n".join(users))
+        finally:
+            self._suspend_form_trace = False
         self._on_app_form_changed()
 
     def _build_app_config_payload(self, *, strict: bool) -> Dict[str, Any]:
@@ -1540,6 +2067,9 @@ class DamaiGUI:
                 existing_caps.pop(cap_key, None)
         payload["device_caps"] = existing_caps
 
+        if self.app_device_overrides:
+            payload["devices"] = [dict(item) for item in self.app_device_overrides]
+
         return payload
 
     def _collect_app_config_from_form(self, *, strict: bool = True) -> Optional[Any]:
@@ -1664,17 +2194,17 @@ class DamaiGUI:
         self.env_status_label.config(text="点击检测环境", foreground="orange")
 
         if mode == "web":
-            if hasattr(self, "login_btn"):
+            if self.login_btn is not None:
                 self.login_btn.config(state="disabled")
-            if hasattr(self, "analyze_btn"):
+            if self.analyze_btn is not None:
                 self.analyze_btn.config(state="disabled")
-            if hasattr(self, "start_btn"):
+            if self.start_btn is not None:
                 self.start_btn.config(state="disabled")
             self.log("🔁 已切换到网页模式")
         else:
-            if hasattr(self, "start_btn"):
+            if self.start_btn is not None:
                 self.start_btn.config(state="disabled")
-            if hasattr(self, "stop_btn"):
+            if self.stop_btn is not None:
                 self.stop_btn.config(state="disabled")
             self._refresh_app_start_button()
             self.log("🔁 已切换到 App 模式，请先检测环境并完善配置表单")
@@ -1682,14 +2212,24 @@ class DamaiGUI:
     def _get_default_app_config_path(self) -> Optional[str]:
         """尝试查找默认的 App 配置文件路径"""
 
-        candidates = [
-            Path.cwd() / "damai_appium" / "config.jsonc",
-            Path.cwd() / "damai_appium" / "config.json",
-        ]
-        for path in candidates:
+        cwd = os.getcwd()
+        cached = self._default_app_config_path_cache
+        if cached is not None and cached[0] == cwd:
+            return cached[1]
+
+        found: Optional[str] = None
+        for rel_path in _DEFAULT_APP_CONFIG_CANDIDATES:
+            path = Path(rel_path)
             if path.exists():
-                return str(path)
-        return None
+                found = str(path.resolve())
+                break
+        self._default_app_config_path_cache = (cwd, found)
+        return found
+
+    def _invalidate_default_config_path_cache(self) -> None:
+        """清除默认配置路径缓存，下次查找时重新探测文件系统。"""
+
+        self._default_app_config_path_cache = None
 
     def select_app_config(self) -> None:
         """选择 App 配置文件"""
@@ -1699,6 +2239,7 @@ class DamaiGUI:
             filetypes=[("JSON/JSONC", "*.jsonc *.json"), ("所有文件", "*.*")],
         )
         if file_path:
+            self._invalidate_default_config_path_cache()
             self.app_config_path_var.set(file_path)
             self._auto_load_app_config()
     
@@ -1725,41 +2266,42 @@ class DamaiGUI:
         if not path.exists():
             return
         
+        self._apply_app_config(path, interactive=False)
+
+    def _load_app_config_cached(self, path: Path) -> Tuple[Any, List[Dict[str, Any]]]:
+        """按文件 mtime/大小缓存解析结果（基础配置与 devices 覆盖项），文件未变化时直接复用。"""
+
+        stat = path.stat()
+        cached = self._app_config_cache.get((str(path), stat.st_mtime_ns, stat.st_size))
+        if cached is not None:
+            return cached
+
+        # 只读取一次文件，基础配置与 devices 覆盖项出自同一份内容；
+        # 缓存键取自读取所用句柄的 fstat，读取期间文件被替换也不会与内容错配
+        with path.open("rb") as fp:
+            data = json.loads(fp.read())
+            stat = os.fstat(fp.fileno())
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
         try:
-            config = AppTicketConfig.load(path)
-            self.app_loaded_config = config
-            self.app_config_data = {
-                "path": str(path),
-                "config": config,
-            }
-            self._populate_app_form(config)
-            self.app_config_status.config(text="配置加载成功", foreground="green")
-            self.log(f"✅ 已自动加载 App 配置: {path.name}")
-            self._last_config_errors = []
-
-            if self.mode_var.get() == "app":
-                self.mark_step("3. 参数配置", "completed")
-            self._refresh_app_start_button()
-        except Exception as exc:  # noqa: BLE001
-            self.app_config_status.config(text="配置加载失败", foreground="red")
-            self.app_config_ready = False
-            if ConfigValidationError is not None and isinstance(exc, ConfigValidationError):
-                errors = list(exc.errors)
-                self._last_config_errors = errors
-                self._show_config_validation_error("配置校验失败", exc.message, errors)
-            else:
-                self._last_config_errors = [str(exc)]
-                self.log(f"❌ 配置自动加载失败: {exc}")
+            config = AppTicketConfig.from_mapping(data)
+        except ConfigValidationError as exc:
+            raise ConfigValidationError(exc.errors, message=f"{path.name} 配置校验失败") from exc
+        # from_mapping 只返回基础配置，devices 覆盖项另行保留，运行时再交给 from_mapping_multi 合并
+        devices = data.get("devices") if isinstance(data, dict) else None
+        overrides = [dict(item) for item in devices or [] if isinstance(item, dict)]
+        # 同一路径只保留最新版本，避免缓存无限增长
+        for stale_key in [k for k in self._app_config_cache if k[0] == key[0]]:
+            del self._app_config_cache[stale_key]
+        self._app_config_cache[key] = (config, overrides)
+        return config, overrides
 
     def open_app_docs(self) -> None:
         """打开 App 模式文档"""
 
-        doc_candidates = [
-            Path.cwd() / "damai_appium" / "app.md",
-            Path.cwd() / "doc" / "app.md",
-        ]
-        for doc_path in doc_candidates:
+        for rel_path in _APP_DOC_CANDIDATES:
+            doc_path = Path(rel_path)
             if doc_path.exists():
+                doc_path = doc_path.resolve()
                 try:
                     os.startfile(doc_path)  # type: ignore[attr-defined]
                 except Exception:
@@ -1774,6 +2316,8 @@ class DamaiGUI:
             messagebox.showerror("错误", "当前环境未启用 Appium，无法加载配置。")
             return
 
+        self._invalidate_default_config_path_cache()
+
         config_path = self.app_config_path_var.get().strip()
         if not config_path:
             messagebox.showwarning("提示", "请先选择配置文件路径。")
@@ -1787,16 +2331,23 @@ class DamaiGUI:
         if self.mode_var.get() == "app":
             self.mark_step("3. 参数配置", "active")
 
+        self._apply_app_config(path, interactive=True)
+
+    def _apply_app_config(self, path: Path, *, interactive: bool) -> None:
+        """解析配置并回填表单；interactive 为 True 时失败会弹窗提示，否则只写日志。"""
+
         try:
-            config = AppTicketConfig.load(path)
+            config, overrides = self._load_app_config_cached(path)
             self.app_loaded_config = config
+            self.app_device_overrides = overrides
             self.app_config_data = {
                 "path": str(path),
                 "config": config,
             }
             self._populate_app_form(config)
             self.app_config_status.config(text="配置加载成功", foreground="green")
-            self.log(f"✅ 已加载 App 配置: {path.name}")
+            action = "已加载" if interactive else "已自动加载"
+            self.log(f"✅ {action} App 配置: {path.name}")
             self._last_config_errors = []
 
             if self.mode_var.get() == "app":
@@ -1811,8 +2362,11 @@ class DamaiGUI:
                 self._show_config_validation_error("配置校验失败", exc.message, errors)
             else:
                 self._last_config_errors = [str(exc)]
-                messagebox.showerror("错误", f"配置加载失败: {exc}")
-                self.log(f"❌ 配置加载失败: {exc}")
+                if interactive:
+                    messagebox.showerror("错误", f"配置加载失败: {exc}")
+                    self.log(f"❌ 配置加载失败: {exc}")
+                else:
+                    self.log(f"❌ 配置自动加载失败: {exc}")
 
     def save_app_config(self) -> None:
         """保存 App 模式配置到文件"""
@@ -1832,10 +2386,11 @@ class DamaiGUI:
             # 从表单收集配置
             config = self._collect_app_config_from_form(strict=True)
             
-            # 保存配置到文件
-
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(asdict(config), f, ensure_ascii=False, indent=2)
+            # 保存配置到文件（AppTicketConfig 不含嵌套 dataclass，浅层映射即可，无需 asdict 深拷贝）
+            payload = {item.name: getattr(config, item.name) for item in fields(config)}
+            if self.app_device_overrides:
+                payload["devices"] = self.app_device_overrides
+            _write_json_atomic(path, payload)
             
             # 更新状态
             self.app_config_status.config(text="配置保存成功", foreground="green")
@@ -1874,8 +2429,7 @@ class DamaiGUI:
                 web_config['target_url'] = self.target_url
             
             # 保存配置到文件
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(web_config, f, ensure_ascii=False, indent=2)
+            _write_json_atomic(path, web_config)
             
             self.log(f"✅ 已保存 Web 配置到: {path.name}")
         except Exception as exc:  # noqa: BLE001
@@ -1884,15 +2438,8 @@ class DamaiGUI:
     def _set_app_summary_text(self, config: Any) -> None:
         """更新配置摘要显示"""
 
-        self.app_summary_text.config(state="normal")
-        self.app_summary_text.delete("1.0", tk.END)
-
         if not config:
-            self.app_summary_text.insert(
-                tk.END,
-                "暂无有效配置，请在左侧表单填写 Appium 服务、设备信息和抢票参数。",
-            )
-            self.app_summary_text.config(state="disabled")
+            self._render_app_summary("暂无有效配置，请在左侧表单填写 Appium 服务、设备信息和抢票参数。")
             return
 
         summary_lines = [
@@ -1915,7 +2462,17 @@ class DamaiGUI:
         elif self.mode_var.get() == "app":
             summary_lines.append("📱 已连接设备: 暂未检测到，可在“环境检测”后查看日志。")
 
-        self.app_summary_text.insert(tk.END, "\n".join(summary_lines))
+        self._render_app_summary("\n".join(summary_lines))
+
+    def _render_app_summary(self, text: str) -> None:
+        """写入摘要文本框；内容与上次相同则跳过 Text 控件的删除/插入。"""
+
+        if text == self._last_summary_str:
+            return
+        self._last_summary_str = text
+        self.app_summary_text.config(state="normal")
+        self.app_summary_text.delete("1.0", tk.END)
+        self.app_summary_text.insert(tk.END, text)
         self.app_summary_text.config(state="disabled")
 
     # ------------------------------
@@ -1955,9 +2512,11 @@ class DamaiGUI:
         
         self.schedule_status_var.set("已预约：倒计时准备中…")
         self.log(f"⏰ 已预约定时抢票：{selection}")
-        # 计算并显示剩余时间
-        remaining_seconds = int(target_epoch - now)
-        remaining_time = time.strftime("%H:%M:%S", time.gmtime(remaining_seconds))
+        # 计算并显示剩余时间；倒计时改用单调时钟，避免系统校时/夏令时导致提前或重复触发
+        remaining_f = target_epoch - now
+        self._schedule_monotonic_deadline = time.monotonic() + remaining_f
+        remaining_seconds = int(remaining_f)
+        remaining_time = _fmt_hms(remaining_seconds)
         self.log(f"📅 距离开抢还有：{remaining_time}")
         
         # 保存配置到文件
@@ -1970,61 +2529,29 @@ class DamaiGUI:
         self._preheat_executed = False
         
         # 定义倒计时更新回调函数
+        # 每秒回调一次，把用到的绑定方法预先取到局部变量里
+        current_warmup = self._current_warmup_seconds
+        status_set = self.schedule_status_var.set
+        maybe_start_preheat = self._maybe_start_preheat
+
         def on_countdown_update(remaining):
-            try:
-                warmup = max(int(self.schedule_warmup_var.get() or 0), 0)
-            except Exception:
-                warmup = 0
+            warmup = current_warmup()
             
             # 更新状态文本，包含预热信息
-            self.schedule_status_var.set(f"倒计时：{remaining} 秒（预热 {warmup}s）")
+            status_set(f"倒计时：{remaining} 秒（预热 {warmup}s）")
             
             # 预热检查触发点 - 当剩余时间小于等于预热秒数且未执行过预热时触发
-            if warmup > 0 and remaining <= warmup and not self._preheat_executed:
-                # 使用 after_idle 执行日志记录，避免阻塞主线程
-                def log_preheat_start():
-                    self.log("🔧 进入预热阶段，开始执行城市选择和搜索目标")
-                self.root.after_idle(log_preheat_start)
-                
-                self._preheat_executed = True  # 立即标记为已执行，避免重复触发
-                # 在单独的线程中执行预热操作，避免阻塞倒计时
-                def run_preheat():
-                    try:
-                        # 执行预热健康检查
-                        self._preheat_checks()
-                        
-                        # 执行实际的预热操作（城市选择和搜索）
-                        if APPIUM_AVAILABLE and DamaiAppTicketRunner is not None:
-                            config = self._collect_app_config_from_form()
-                            self.app_runner = DamaiAppTicketRunner(
-                                config=config,
-                                logger=self._app_runner_logger,
-                                stop_signal=lambda: self.app_should_stop,
-                            )
-                            self.app_runner.preheat()
-                            # 使用 after_idle 执行日志记录，避免阻塞主线程
-                            self.root.after_idle(lambda: self.log("✅ 预热完成：已连接Appium、选择城市并搜索目标"))
-                        else:
-                            # 使用 after_idle 执行日志记录，避免阻塞主线程
-                            self.root.after_idle(lambda: self.log("⚠️ Appium环境不可用，跳过预热操作"))
-                    except Exception as exc:  # noqa: BLE001
-                        self.root.after_idle(lambda: self.schedule_status_var.set(f"预热失败：{exc}"))
-                        self.root.after_idle(lambda: self.countdown_timer.stop())
-                
-                # 启动预热线程
-                preheat_thread = threading.Thread(target=run_preheat, daemon=True)
-                preheat_thread.start()
+            maybe_start_preheat(remaining, warmup)
         
         # 定义倒计时结束回调函数
         def on_countdown_finish():
             # 清理预热相关属性
-            if hasattr(self, '_preheat_executed'):
-                delattr(self, '_preheat_executed')
+            self._preheat_executed = False
                 
             self.schedule_status_var.set("到点执行：开始抢票…")
             
             # 如果有预热好的runner，直接使用它的run方法
-            if hasattr(self, 'app_runner') and self.app_runner is not None:
+            if self.app_runner is not None:
                 try:
                     max_retries = max(1, int(self.app_retries_var.get()))
                 except Exception:
@@ -2048,7 +2575,11 @@ class DamaiGUI:
                 self.app_runner_thread.start()
         
         # 启动新的倒计时组件
-        self.countdown_timer.start(remaining_seconds, on_finish=on_countdown_finish, on_update=on_countdown_update)
+        self.countdown_timer.start(
+            self._schedule_monotonic_deadline - time.monotonic(),
+            on_finish=on_countdown_finish,
+            on_update=on_countdown_update,
+        )
 
     def _parse_start_time_to_epoch(self, text: str) -> Optional[float]:
         """解析用户输入的开抢时间为 epoch 秒，支持 ISO8601 或 'YYYY-MM-DD HH:MM:SS' 本地时区。"""
@@ -2109,25 +2640,17 @@ class DamaiGUI:
                             pass
                 except ValueError:
                     messagebox.showerror("错误", "日期时间格式不正确，请使用 YYYY-MM-DD HH:MM 或 YYYY-MM-DD HH:MM:SS 格式")
-    
 
-        
+    def _schedule_tick(self) -> None:
+        """旧版定时流程的倒计时心跳：每个整秒边界唤醒一次。"""
+
         if not self._schedule_running:
             return
 
-        # 初始化必要的属性
-        if not hasattr(self, '_preheat_executed'):
-            self._preheat_executed = False
-        if not hasattr(self, '_current_displayed_time'):
-            self._current_displayed_time = -1  # 初始值设为-1，确保第一次能更新
-
         # 每次都重新计算剩余时间，确保基于实际当前时间
-        now = time.time()
-        remaining = max(int(self._schedule_target_epoch - now), 0)
-        try:
-            warmup = max(int(self.schedule_warmup_var.get() or 0), 0)
-        except Exception:
-            warmup = 0
+        remaining_f = self._schedule_monotonic_deadline - time.monotonic()
+        remaining = max(int(math.ceil(remaining_f)), 0)
+        warmup = self._current_warmup_seconds()
 
         if remaining > 0:
             
@@ -2137,44 +2660,10 @@ class DamaiGUI:
                 self._current_displayed_time = remaining
             
             # 预热检查触发点 - 当剩余时间小于等于预热秒数且未执行过预热时触发
-            if warmup > 0 and remaining <= warmup and not self._preheat_executed:
-                # 使用 after_idle 执行日志记录，避免阻塞主线程
-                def log_preheat_start():
-                    self.log("🔧 进入预热阶段，开始执行城市选择和搜索目标")
-                self.root.after_idle(log_preheat_start)
-                
-                self._preheat_executed = True  # 立即标记为已执行，避免重复触发
-                
-                # 在单独的线程中执行预热操作，避免阻塞倒计时
-                def run_preheat():
-                    try:
-                        # 执行预热健康检查
-                        self._preheat_checks()
-                        
-                        # 执行实际的预热操作（城市选择和搜索）
-                        if APPIUM_AVAILABLE and DamaiAppTicketRunner is not None:
-                            config = self._collect_app_config_from_form()
-                            self.app_runner = DamaiAppTicketRunner(
-                                config=config,
-                                logger=self._app_runner_logger,
-                                stop_signal=lambda: self.app_should_stop,
-                            )
-                            self.app_runner.preheat()
-                            # 使用 after_idle 执行日志记录，避免阻塞主线程
-                            self.root.after_idle(lambda: self.log("✅ 预热完成：已连接Appium、选择城市并搜索目标"))
-                        else:
-                            # 使用 after_idle 执行日志记录，避免阻塞主线程
-                            self.root.after_idle(lambda: self.log("⚠️ Appium环境不可用，跳过预热操作"))
-                    except Exception as exc:  # noqa: BLE001
-                        self.root.after_idle(lambda: self.schedule_status_var.set(f"预热失败：{exc}"))
-                        self.root.after_idle(lambda: setattr(self, '_schedule_running', False))
-                
-                # 启动预热线程
-                import threading
-                preheat_thread = threading.Thread(target=run_preheat, daemon=True)
-                preheat_thread.start()
-            # 使用高频检查（100ms）确保不会跳过数字
-            self._schedule_timer_id = self.root.after(100, self._schedule_tick)
+            self._maybe_start_preheat(remaining, warmup)
+            # 休眠到下一个整秒边界再唤醒，既不跳过数字也不空转事件循环
+            delay_ms = max(int((remaining_f - math.floor(remaining_f)) * 1000), 10)
+            self._schedule_timer_id = self.root.after(delay_ms, self._schedule_tick)
             return
 
         # 到点执行
@@ -2183,13 +2672,11 @@ class DamaiGUI:
         self._schedule_timer_id = None
         
         # 清理倒计时相关属性
-        if hasattr(self, '_preheat_executed'):
-            delattr(self, '_preheat_executed')
-        if hasattr(self, '_current_displayed_time'):
-            delattr(self, '_current_displayed_time')
+        self._preheat_executed = False
+        self._current_displayed_time = -1
         
         # 如果有预热好的runner，直接使用它的run方法
-        if hasattr(self, 'app_runner') and self.app_runner is not None:
+        if self.app_runner is not None:
             try:
                 max_retries = max(1, int(self.app_retries_var.get()))
             except Exception:
@@ -2215,20 +2702,85 @@ class DamaiGUI:
             # 没有预热好的runner，使用传统方式
             self._start_app_grabbing()
 
-    def _preheat_checks(self) -> None:
+    def _invalidate_warmup_cache(self, *_args: Any) -> None:
+        self._warmup_cache = None
+
+    def _current_warmup_seconds(self) -> int:
+        """返回预热秒数（非法输入按 0 处理），仅在变量改动后重新解析。"""
+
+        warmup = self._warmup_cache
+        if warmup is None:
+            try:
+                warmup = max(int(self.schedule_warmup_var.get() or 0), 0)
+            except Exception:
+                warmup = 0
+            self._warmup_cache = warmup
+        return warmup
+
+    def _maybe_start_preheat(self, remaining: int, warmup: int) -> None:
+        """剩余时间进入预热窗口且本轮尚未预热时，提交一次后台预热。"""
+
+        if not (warmup > 0 and remaining <= warmup) or self._preheat_executed:
+            return
+        self._preheat_executed = True  # 立即标记为已执行，避免重复触发
+        # 使用 after_idle 执行日志记录，避免阻塞主线程
+        self.root.after_idle(self._on_preheat_start)
+        # Tk 变量只能在主线程读取，先收集好配置再交给后台线程
+        config = self._collect_app_config_from_form(strict=False)
+        # 交给常驻后台线程池执行预热，避免阻塞倒计时
+        self._bg_pool.submit(self._run_preheat_once, config)
+
+    def _run_preheat_once(self, config: Any) -> None:
+        """后台线程：健康检查后连接 Appium 完成城市选择和搜索，结果投递回界面队列。"""
+
+        try:
+            # 执行预热健康检查（配置无效时在此报错）
+            self._preheat_checks(config)
+
+            # 执行实际的预热操作（城市选择和搜索）
+            if APPIUM_AVAILABLE and DamaiAppTicketRunner is not None:
+                self.app_runner = DamaiAppTicketRunner(
+                    config=config,
+                    logger=self._app_runner_logger,
+                    stop_signal=lambda: self.app_should_stop,
+                )
+                self.app_runner.preheat()
+                # 投递到界面队列，由主线程统一执行日志记录
+                self._post_to_ui(self._on_preheat_done)
+            else:
+                self._post_to_ui(self._on_appium_unavailable)
+        except Exception as exc:  # noqa: BLE001
+            self._post_to_ui(self._on_preheat_failed, f"预热失败：{exc}")
+
+    def _on_preheat_failed(self, message: str) -> None:
+        """预热失败：停止倒计时（新旧两种定时流程都适用）。"""
+
+        self.schedule_status_var.set(message)
+        self.countdown_timer.stop()
+        self._schedule_running = False
+
+    def _on_preheat_start(self) -> None:
+        self.log("🔧 进入预热阶段，开始执行城市选择和搜索目标")
+
+    def _on_preheat_done(self) -> None:
+        self.log("✅ 预热完成：已连接Appium、选择城市并搜索目标")
+
+    def _on_appium_unavailable(self) -> None:
+        self.log("⚠️ Appium环境不可用，跳过预热操作")
+
+    def _preheat_checks(self, config: Any) -> None:
         """执行预热健康检查：Appium /status 与 adb 设备可用性。"""
+        log = self._log_from_thread
         # Appium 服务探活与能力解析
-        config = self._validate_app_server()
+        config = self._probe_app_server(config, log=log)
         # 设备就绪性检查
-        has_ready_device = self._detect_connected_devices()
-        if not has_ready_device:
+        labels, records = self._scan_connected_devices(log=log)
+        self._post_to_ui(self._apply_detected_devices, labels, records)
+        if not labels:
             raise RuntimeError("未检测到可用设备，请检查 USB/授权后重试")
         # 更新摘要（可选） - 确保在主线程中执行UI更新
-        try:
-            self.root.after(0, lambda: self._set_app_summary_text(config))
-            self.root.after(0, lambda: self.schedule_status_var.set("预热检查通过"))
-        except Exception:  # noqa: BLE001
-            pass
+        self._post_to_ui(self._set_app_summary_text, config)
+        self._post_to_ui(self.schedule_status_var.set, "预热检查通过")
 
     def _schedule_cancel(self) -> None:
         """取消预约：停止倒计时并重置状态。"""
@@ -2236,8 +2788,7 @@ class DamaiGUI:
         self.countdown_timer.stop()
         
         # 清理倒计时相关属性
-        if hasattr(self, '_preheat_executed'):
-            delattr(self, '_preheat_executed')
+        self._preheat_executed = False
             
         self.schedule_status_var.set("未预约")
         self.log("❌ 已取消定时预约")
@@ -2273,10 +2824,18 @@ class DamaiGUI:
     def _on_log_filter_changed(self, *_args: Any) -> None:
         self._refresh_log_view()
 
+    @property
+    def log_entries(self) -> Iterator[Tuple[str, str, str]]:
+        """按 (时间, 内容, 级别) 逐条迭代日志历史。"""
+
+        return zip(self._log_ts, self._log_msg, self._log_level)
+
     def clear_logs(self) -> None:
         """清空日志窗口与历史记录。"""
 
-        self.log_entries.clear()
+        self._log_ts.clear()
+        self._log_msg.clear()
+        self._log_level.clear()
         if hasattr(self, "log_text"):
             self.log_text.delete("1.0", tk.END)
             self.log_text.see(tk.END)
@@ -2284,16 +2843,9 @@ class DamaiGUI:
 
     def _infer_log_level(self, message: str) -> str:
         normalized = message.strip()
-        lowered = normalized.lower()
-
-        if normalized.startswith("❌") or "错误" in normalized or "fail" in lowered:
-            return "error"
-        if normalized.startswith("⚠️") or "警告" in normalized or "warning" in lowered:
-            return "warning"
-        if normalized.startswith("✅") or normalized.startswith("✔") or "成功" in normalized:
-            return "success"
-        if normalized.startswith("ℹ️") or normalized.startswith("📢"):
-            return "info"
+        for level, pattern in _LOG_LEVEL_PATTERNS:
+            if pattern.search(normalized):
+                return level
         return "info"
 
     def _log_passes_filter(self, level: str) -> bool:
@@ -2310,26 +2862,27 @@ class DamaiGUI:
         target_level = mapping.get(selected)
         return target_level is None or level == target_level
 
-    def _append_log_entry(self, entry: Tuple[str, str, str], *, auto_scroll: bool = True) -> None:
-        timestamp, message, _level = entry
+    def _append_log_entry(self, timestamp: str, message: str, level: str, *, auto_scroll: bool = True) -> None:
         log_message = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_message)
+        if self._log_batch is not None:
+            self._log_batch.append(log_message)
+            self._log_batch.append((level,))
+            return
+        # 以日志级别作为文本标签，筛选时只需切换标签的 elide 属性
+        self.log_text.insert(tk.END, log_message, (level,))
         if auto_scroll:
             self.log_text.see(tk.END)
 
     def _refresh_log_view(self) -> None:
+        """按当前筛选条件隐藏/显示各级别日志，无需重建整个文本区域。"""
+
         if not hasattr(self, "log_text"):
             return
 
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", tk.END)
-
-        for entry in self.log_entries:
-            if self._log_passes_filter(entry[2]):
-                self._append_log_entry(entry, auto_scroll=False)
+        for level in _LOG_LEVELS:
+            self.log_text.tag_configure(level, elide=not self._log_passes_filter(level))
 
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
 
     def log(self, message: str, level: Optional[str] = None) -> None:
         """添加日志信息并记录在历史中。"""
@@ -2337,19 +2890,79 @@ class DamaiGUI:
         if level is None:
             level = self._infer_log_level(message)
 
-        timestamp = time.strftime("%H:%M:%S")
-        entry = (timestamp, message, level)
-        self.log_entries.append(entry)
+        # 同一秒内的日志复用已格式化的时间戳，避免每条日志都调用 strftime
+        now_sec = int(time.time())
+        if self._last_ts[0] != now_sec:
+            self._last_ts = (now_sec, time.strftime("%H:%M:%S", time.localtime(now_sec)))
+        timestamp = self._last_ts[1]
+        history = self._log_msg
+        evicted = history[0] if len(history) == history.maxlen else None
+        self._log_ts.append(timestamp)
+        history.append(message)
+        self._log_level.append(level)
 
         if not hasattr(self, "log_text"):
             return
 
-        if self._log_passes_filter(level):
-            self._append_log_entry(entry)
-        else:
-            # 过滤后不显示，但保持滚动位置
-            self.log_text.see(tk.END)
-            self.root.update_idletasks()
+        if evicted is not None:
+            # 与历史记录同步裁剪窗口内容（多行消息占用多行文本）
+            line_count = evicted.count("\n") + 1
+            if self._log_batch is not None:
+                self._log_batch_evicted_lines += line_count
+            else:
+                self.log_text.delete("1.0", f"{line_count + 1}.0")
+
+        # 被筛选掉的级别由标签隐藏，仍写入文本以便切换筛选时直接显示
+        self._append_log_entry(timestamp, message, level, auto_scroll=False)
+        self._schedule_log_flush()
+
+    @contextmanager
+    def _with_batched_ui_updates(self) -> Iterator[None]:
+        """在此范围内产生的日志先暂存，退出时用一次 Text insert 写入窗口（可嵌套）。"""
+
+        if self._log_batch is not None:
+            yield
+            return
+
+        self._log_batch = []
+        self._log_batch_evicted_lines = 0
+        try:
+            yield
+        finally:
+            self._flush_log_batch()
+            self._log_batch = None
+
+    def _flush_log_batch(self) -> None:
+        """立即写出暂存的日志（弹出模态对话框前调用，保证用户先看到日志）。"""
+
+        batch = self._log_batch
+        if not batch and not self._log_batch_evicted_lines:
+            return
+        evicted_lines, self._log_batch_evicted_lines = self._log_batch_evicted_lines, 0
+        if batch is not None:
+            self._log_batch = []
+        if not hasattr(self, "log_text"):
+            return
+        if batch:
+            # Tk 的 insert 支持多组 (文本, 标签)，一次 Tcl 调用写入整批日志
+            self.log_text.insert(tk.END, *batch)
+        if evicted_lines:
+            self.log_text.delete("1.0", f"{evicted_lines + 1}.0")
+
+    def _schedule_log_flush(self) -> None:
+        """合并连续日志的界面刷新：一批日志只滚动/重绘一次。"""
+
+        if self._log_flush_scheduled:
+            return
+        self._log_flush_scheduled = True
+        self.root.after_idle(self._flush_log_ui)
+
+    def _flush_log_ui(self) -> None:
+        self._log_flush_scheduled = False
+        if not hasattr(self, "log_text"):
+            return
+        self.log_text.see(tk.END)
+        self.root.update_idletasks()
 
     def _update_app_metrics_display(self, report: Optional[Any]) -> None:
         if report is None or not hasattr(report, "metrics"):
@@ -2409,18 +3022,11 @@ class DamaiGUI:
         if not target_path:
             return
 
-        payload = {
-            "exported_at": datetime.now().isoformat(timespec="seconds"),
-            "app_run_report": self.last_app_report.to_dict() if self.last_app_report else None,
-            "log_entries": [
-                {"timestamp": ts, "message": msg, "level": level}
-                for ts, msg, level in self.log_entries
-            ],
-        }
+        header = _log_export_header(self.last_app_report.to_dict() if self.last_app_report else None)
 
         try:
-            with open(target_path, "w", encoding="utf-8") as fp:
-                json.dump(payload, fp, ensure_ascii=False, indent=2)
+            with open(target_path, "wb") as fp:
+                _stream_log_export(fp, header, _log_export_entries(self.log_entries))
         except Exception as exc:  # noqa: BLE001
             messagebox.showerror("导出失败", f"无法写入日志文件：{exc}")
             return
@@ -2432,48 +3038,84 @@ class DamaiGUI:
         if self.url_entry.get() == "请输入大麦网演出详情页链接...":
             self.url_entry.delete(0, tk.END)
             
-    def check_environment(self):
-        """检测环境"""
+    def check_environment(self, *, force: bool = False):
+        """检测环境；force 为 True（按住 Shift 点击）时忽略命令行探测结果缓存"""
         step_label = "1. 环境检测"
         self.mark_step(step_label, "active")
-        self.log("🔍 开始检测环境...")
+        self.log("🔍 开始检测环境..." if not force else "🔍 开始完整检测环境（忽略缓存）...")
+
+        # 用户主动重新检测时丢弃缓存的命令路径，以便识别刚安装/卸载的工具；
+        # 探测失败的结果本就不缓存，成功结果在有效期内复用，只有强制检测时才丢弃
+        self._cli_path_cache.clear()
+        self._cli_dir_listing_cache.clear()
+        if force:
+            self._cli_result_cache.clear()
 
         if self.mode_var.get() == "app":
             self._check_app_environment()
         else:
             self._check_web_environment()
 
+    def _on_force_check_environment(self, _event: tk.Event) -> str:
+        if str(self.check_env_btn["state"]) != "disabled":
+            self.check_environment(force=True)
+        return "break"
+
     def _check_web_environment(self) -> None:
-        try:
-            python_version = sys.version.split()[0]
-            self.log(f"✅ Python版本: {python_version}")
+        """在主线程完成轻量检查，启动 Chrome 验证驱动的耗时步骤交给后台线程。"""
+
+        if self._env_check_in_progress:
+            self.log("ℹ️ 环境检测进行中，请稍候...")
+            return
 
-            if not SELENIUM_AVAILABLE:
-                raise RuntimeError("Selenium未安装，请先安装：pip install selenium")
-            self.log("✅ Selenium已安装")
+        python_version = sys.version.split()[0]
+        self.log(f"✅ Python版本: {python_version}")
+
+        if not SELENIUM_AVAILABLE:
+            self._finish_web_environment_check(
+                RuntimeError("Selenium未安装，请先安装：pip install selenium")
+            )
+            return
+        self.log("✅ Selenium已安装")
+
+        self._env_check_in_progress = True
+        self.env_status_label.config(text="正在检测浏览器驱动...", foreground="blue")
+        self._bg_pool.submit(self._check_web_driver_worker)
+
+    def _check_web_driver_worker(self) -> None:
+        """后台线程：共享浏览器仍存活时直接视为可用，否则启动一次无界面的临时 Chrome 验证驱动"""
+        try:
+            driver = self.driver
+            if driver is None or not self._driver_alive(driver):
+                webdriver.Chrome(
+                    options=_build_chrome_options(headless=True, persistent_profile=False)
+                ).quit()
+        except Exception as exc:  # noqa: BLE001
+            self._post_to_ui(self._finish_web_environment_check, exc)
+        else:
+            self._post_to_ui(self._finish_web_environment_check, None)
 
-            options = webdriver.ChromeOptions()
-            options.add_argument('--headless')
-            driver = webdriver.Chrome(options=options)
-            driver.quit()
-            self.log("✅ Chrome浏览器驱动正常")
+    def _finish_web_environment_check(self, error: Optional[BaseException]) -> None:
+        self._env_check_in_progress = False
 
-        except Exception as exc:
-            self.log(f"❌ 环境检测出错: {exc}")
+        if error is not None:
+            self.log(f"❌ 环境检测出错: {error}")
             self.env_status_label.config(text="环境检测异常", foreground="red")
             self.mark_step("1. 环境检测", "error")
-            messagebox.showerror("错误", str(exc))
+            messagebox.showerror("错误", str(error))
             return
 
+        self.log("✅ Chrome浏览器驱动正常")
         self.env_status_label.config(text="环境检测完成", foreground="green")
         self.mark_step("1. 环境检测", "completed")
         self.log("✅ 环境检测完成，所有组件正常")
 
-        if hasattr(self, "login_btn"):
+        if self.login_btn is not None:
             self.login_btn.config(state="normal")
-        if hasattr(self, "analyze_btn"):
+        if self.analyze_btn is not None:
             self.analyze_btn.config(state="normal")
 
+        # 自动登录在 _web_pool 中启动共享浏览器，不阻塞界面
         self._try_auto_login()
 
     # ------------------------------------------------------------------
@@ -2481,49 +3123,69 @@ class DamaiGUI:
     # ------------------------------------------------------------------
 
     def _resolve_cli_command(self, command: str) -> Optional[str]:
-        """Locate an executable on PATH with Windows fallbacks."""
+        """Locate an executable on PATH with Windows fallbacks (cached for _CLI_CACHE_TTL)."""
+
+        now = time.monotonic()
+        cached = self._cli_path_cache.get(command)
+        if cached is not None and now - cached[1] < _CLI_CACHE_TTL:
+            return cached[0]
+
+        resolved = self._lookup_cli_command(command)
+        self._cli_path_cache[command] = (resolved, now)
+        return resolved
 
+    def _lookup_cli_command(self, command: str) -> Optional[str]:
         resolved = shutil.which(command)
         if resolved:
             return resolved
 
-        if os.name == "nt":
-            candidates: list[Path] = []
+        for directory, suffixes in self._windows_cli_dirs:
+            entries = self._list_cli_dir(directory)
+            for suffix in suffixes:
+                found = entries.get(f"{command}{suffix}".lower())
+                if found:
+                    return found
 
-            appdata = os.environ.get("APPDATA")
-            if appdata:
-                npm_dir = Path(appdata) / "npm"
-                candidates.extend(
-                    npm_dir / f"{command}{suffix}"
-                    for suffix in (".cmd", ".exe", "")
-                )
-
-            program_files = os.environ.get("PROGRAMFILES")
-            if program_files:
-                candidates.append(Path(program_files) / "nodejs" / f"{command}.exe")
+        return None
 
-            program_files_x86 = os.environ.get("PROGRAMFILES(X86)")
-            if program_files_x86:
-                candidates.append(Path(program_files_x86) / "nodejs" / f"{command}.exe")
+    def _list_cli_dir(self, directory: Path) -> Dict[str, str]:
+        """一次 scandir 列出目录（小写文件名 -> 路径），在 _CLI_CACHE_TTL 内复用。"""
 
-            for candidate in candidates:
-                if candidate and candidate.exists():
-                    return str(candidate)
+        now = time.monotonic()
+        cached = self._cli_dir_listing_cache.get(directory)
+        if cached is not None and now - cached[0] < _CLI_CACHE_TTL:
+            return cached[1]
 
-        return None
+        try:
+            with os.scandir(directory) as it:
+                entries = {entry.name.lower(): entry.path for entry in it}
+        except OSError:
+            entries = {}
+        self._cli_dir_listing_cache[directory] = (now, entries)
+        return entries
 
     def _check_cli_dependency(self, command: str, args: List[str], friendly_name: str) -> Tuple[bool, str]:
-        """尝试运行外部命令来检查依赖是否存在。"""
+        """尝试运行外部命令来检查依赖是否存在。
+
+        成功结果在 _CLI_CACHE_TTL 内复用，失败总是重新探测。
+        """
 
         executable = self._resolve_cli_command(command)
         if not executable:
             return False, f"未找到 {friendly_name}（命令：{command}），请先安装并添加到 PATH。"
 
+        cache_key = (executable, tuple(args))
+        now = time.monotonic()
+        cached = self._cli_result_cache.get(cache_key)
+        if cached is not None and now - cached[0] < _CLI_CACHE_TTL:
+            return True, cached[1]
+
         try:
             result = subprocess.run(  # noqa: S603,S607
                 [executable, *args],
                 capture_output=True,
-                text=True,
+                encoding="utf-8",
+                errors="replace",
                 timeout=8,
             )
         except Exception as exc:  # noqa: BLE001
@@ -2537,6 +3199,7 @@ class DamaiGUI:
         summary = output.splitlines()[0] if output else "检测通过"
         if executable != command:
             summary = f"{summary}（路径：{executable}）"
+        self._cli_result_cache[cache_key] = (now, summary)
         return True, summary
 
     def _check_node_cli(self) -> Tuple[bool, str]:
@@ -2549,135 +3212,205 @@ class DamaiGUI:
         return self._check_cli_dependency("adb", ["version"], "ADB")
 
     def _check_app_environment(self) -> None:
+        """在主线程读取表单并更新界面状态，然后把耗时探测交给后台线程。"""
+
+        if self._env_check_in_progress:
+            self.log("ℹ️ 环境检测进行中，请稍候...")
+            return
+
         self.app_env_ready = False
         tracking_device_status = self.mode_var.get() == "app"
 
         if tracking_device_status:
             self._device_refresh_in_progress = True
-            if hasattr(self, "app_device_refresh_btn") and (
+            if self.app_device_refresh_btn is not None and (
                 APPIUM_AVAILABLE and parse_adb_devices is not None
             ):
                 self.app_device_refresh_btn.config(state="disabled")
             if APPIUM_AVAILABLE and parse_adb_devices is not None:
                 self._set_device_status("正在检查 Appium 环境...", color="blue")
                 self._set_device_detail("正在请求 Appium 服务并检测已连接的设备...", color="blue")
+
+        # Tk 变量只能在主线程读取，表单内容先收集好再交给后台线程
+        config = self._collect_app_config_from_form(strict=False) if AppTicketConfig is not None else None
+        self._env_check_in_progress = True
+        self._bg_pool.submit(
+            self._check_app_environment_worker,
+            config,
+            self.app_config_ready,
+            tracking_device_status,
+        )
+
+    def _check_app_environment_worker(
+        self,
+        config: Any,
+        config_ready: bool,
+        tracking_device_status: bool,
+    ) -> None:
+        """后台线程：依次执行命令行、Appium 服务与 adb 设备检测，界面更新全部投递回主线程。"""
+
+        post = self._post_to_ui
+        log = self._log_from_thread
         try:
-            config: Any = None
+            # 三个命令行探测互不依赖，并发启动子进程，总耗时取决于最慢的一个；结果仍按原顺序处理
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix="damai-cli") as executor:
+                node_future = executor.submit(self._check_node_cli)
+                appium_future = executor.submit(self._check_appium_cli)
+                adb_future = executor.submit(self._check_adb_cli)
 
-            node_ok, node_message = self._check_node_cli()
+            node_ok, node_message = node_future.result()
             if node_ok:
-                self.log(f"✅ Node.js: {node_message}")
+                log(f"✅ Node.js: {node_message}")
             else:
                 install_hint = (
                     "请先安装 Node.js（https://nodejs.org/），安装时勾选添加到 PATH，"
                     "完成后重新启动本工具。"
                 )
-                self.log(f"❌ {node_message}")
-                self.env_status_label.config(text="缺少 Node.js 环境", foreground="red")
-                self.mark_step("1. 环境检测", "error")
-                if tracking_device_status:
-                    self._set_device_status("无法检测设备", color="red")
-                    self._set_device_detail(install_hint, color="red")
-                messagebox.showerror("缺少依赖", f"{node_message}\n\n{install_hint}")
+                post(
+                    self._report_missing_cli,
+                    node_message,
+                    install_hint,
+                    "缺少 Node.js 环境",
+                    tracking_device_status,
+                )
                 return
 
-            appium_cli_ok, appium_message = self._check_appium_cli()
+            appium_cli_ok, appium_message = appium_future.result()
             if appium_cli_ok:
-                self.log(f"✅ Appium CLI: {appium_message}")
+                log(f"✅ Appium CLI: {appium_message}")
             else:
                 install_hint = (
                     "未检测到 Appium CLI。可在命令行执行 `npm install -g appium` 安装，"
                     "或使用 Appium Inspector 自带的服务器。安装完成后请重新打开本程序。"
                 )
-                self.log(f"❌ {appium_message}")
-                self.env_status_label.config(text="缺少 Appium CLI", foreground="red")
-                self.mark_step("1. 环境检测", "error")
-                if tracking_device_status:
-                    self._set_device_status("无法检测设备", color="red")
-                    self._set_device_detail(install_hint, color="red")
-                messagebox.showerror("缺少依赖", f"{appium_message}\n\n{install_hint}")
+                post(
+                    self._report_missing_cli,
+                    appium_message,
+                    install_hint,
+                    "缺少 Appium CLI",
+                    tracking_device_status,
+                )
                 return
 
-            adb_ok, adb_message = self._check_adb_cli()
+            adb_ok, adb_message = adb_future.result()
             if adb_ok:
-                self.log(f"✅ ADB: {adb_message}")
+                log(f"✅ ADB: {adb_message}")
             else:
                 adb_hint = (
                     "未检测到 adb，请安装 Android 平台工具（Platform Tools）并将其加入 PATH。"
                     "没有 adb 将无法列出设备。"
                 )
-                self.log(f"⚠️ {adb_message}")
+                log(f"⚠️ {adb_message}")
                 if tracking_device_status:
-                    self._set_device_status("未检测到 adb", color="orange")
-                    self._set_device_detail(adb_hint, color="orange")
+                    post(partial(self._set_device_status, "未检测到 adb", color="orange"))
+                    post(partial(self._set_device_detail, adb_hint, color="orange"))
 
             if not APPIUM_AVAILABLE or DamaiAppTicketRunner is None:
-                self.env_status_label.config(text="Appium 环境不可用", foreground="red")
-                self.mark_step("1. 环境检测", "error")
-                self._reset_device_status_ui()
-                messagebox.showerror("错误", "未检测到 Appium 运行环境，请先安装依赖并配置 Python 包。")
+                post(self._report_appium_runtime_missing)
                 return
 
             try:
                 python_version = sys.version.split()[0]
-                self.log(f"✅ Python版本: {python_version}")
+                log(f"✅ Python版本: {python_version}")
             except Exception:
                 pass
 
-            if not self.app_config_ready:
-                self.log("⚠️ 尚未完成配置表单，检测将使用当前输入的默认值。")
+            if not config_ready:
+                log("⚠️ 尚未完成配置表单，检测将使用当前输入的默认值。")
             else:
-                self.mark_step("3. 参数配置", "completed")
+                post(self.mark_step, "3. 参数配置", "completed")
 
             try:
-                config = self._validate_app_server()
+                config = self._probe_app_server(config, log=log)
             except Exception as exc:  # noqa: BLE001
-                self.env_status_label.config(text="Appium 服务异常", foreground="red")
-                self.mark_step("1. 环境检测", "error")
-                # 立即更新Appium按钮状态，修复检测到服务异常但按钮显示不一致的bug
-                self._check_appium_status()
-                messagebox.showerror("错误", f"Appium 服务不可用: {exc}")
+                post(self._report_app_server_error, exc)
                 return
 
             if adb_ok:
-                has_ready_device = self._detect_connected_devices()
+                labels, records = self._scan_connected_devices(log=log)
+                # 设备记录及其索引/缓存由主线程读取，替换也交给主线程，且先于下面的结果处理执行
+                post(self._apply_detected_devices, labels, records)
+                has_ready_device = bool(labels)
             else:
                 has_ready_device = False
-            self._update_device_status_from_result(has_ready_device)
+            post(self._apply_app_environment_result, config, has_ready_device)
+        except Exception as exc:  # noqa: BLE001
+            log(f"❌ 环境检测出错: {exc}")
+            post(self.mark_step, "1. 环境检测", "error")
+        finally:
+            post(self._finish_app_environment_check, tracking_device_status)
 
-            self.app_env_ready = True
-            if has_ready_device:
-                status_text = "Appium 环境准备就绪"
-                status_color = "green"
-                self.mark_step("2. 设备检查", "completed")
-                self.log("✅ Appium 环境检测通过，可以连接设备")
-            else:
-                status_text = "Appium 服务可用（未检测到设备）"
-                status_color = "orange"
-                self.mark_step("2. 设备检查", "error")
-                self.log("⚠️ Appium 服务正常，但未检测到可用设备，请检查 adb 连接或设备授权。")
+    def _report_missing_cli(
+        self,
+        message: str,
+        install_hint: str,
+        status_text: str,
+        tracking_device_status: bool,
+    ) -> None:
+        self.log(f"❌ {message}")
+        self.env_status_label.config(text=status_text, foreground="red")
+        self.mark_step("1. 环境检测", "error")
+        if tracking_device_status:
+            self._set_device_status("无法检测设备", color="red")
+            self._set_device_detail(install_hint, color="red")
+        self._flush_log_batch()
+        messagebox.showerror("缺少依赖", f"{message}\n\n{install_hint}")
+
+    def _report_appium_runtime_missing(self) -> None:
+        self.env_status_label.config(text="Appium 环境不可用", foreground="red")
+        self.mark_step("1. 环境检测", "error")
+        self._reset_device_status_ui()
+        self._flush_log_batch()
+        messagebox.showerror("错误", "未检测到 Appium 运行环境，请先安装依赖并配置 Python 包。")
+
+    def _report_app_server_error(self, exc: Exception) -> None:
+        self.env_status_label.config(text="Appium 服务异常", foreground="red")
+        self.mark_step("1. 环境检测", "error")
+        # 立即更新Appium按钮状态，修复检测到服务异常但按钮显示不一致的bug
+        self._check_appium_status()
+        self._flush_log_batch()
+        messagebox.showerror("错误", f"Appium 服务不可用: {exc}")
+
+    def _apply_app_environment_result(self, config: Any, has_ready_device: bool) -> None:
+        """主线程：根据后台检测结果刷新设备、步骤与按钮状态。"""
+
+        self._update_device_status_from_result(has_ready_device)
+
+        self.app_env_ready = True
+        if has_ready_device:
+            status_text = "Appium 环境准备就绪"
+            status_color = "green"
+            self.mark_step("2. 设备检查", "completed")
+            self.log("✅ Appium 环境检测通过，可以连接设备")
+        else:
+            status_text = "Appium 服务可用（未检测到设备）"
+            status_color = "orange"
+            self.mark_step("2. 设备检查", "error")
+            self.log("⚠️ Appium 服务正常，但未检测到可用设备，请检查 adb 连接或设备授权。")
 
-            self.env_status_label.config(text=status_text, foreground=status_color)
-            self.mark_step("1. 环境检测", "completed")
-            
-            # 更新Appium状态变量，修复检测环境后状态不一致的bug
-            self._check_appium_status()
+        self.env_status_label.config(text=status_text, foreground=status_color)
+        self.mark_step("1. 环境检测", "completed")
 
-            if config is not None:
-                try:
-                    self._set_app_summary_text(config)
-                except Exception:
-                    pass
+        # 更新Appium状态变量，修复检测环境后状态不一致的bug
+        self._check_appium_status()
 
-            if self.app_config_ready and hasattr(self, "start_btn"):
-                self.start_btn.config(state="normal")
-        finally:
-            if tracking_device_status:
-                self._device_refresh_in_progress = False
-                if hasattr(self, "app_device_refresh_btn"):
-                    can_refresh = APPIUM_AVAILABLE and parse_adb_devices is not None
-                    state = "normal" if can_refresh else "disabled"
-                    self.app_device_refresh_btn.config(state=state)
+        if config is not None:
+            try:
+                self._set_app_summary_text(config)
+            except Exception:
+                pass
+
+        if self.app_config_ready and self.start_btn is not None:
+            self.start_btn.config(state="normal")
+
+    def _finish_app_environment_check(self, tracking_device_status: bool) -> None:
+        self._env_check_in_progress = False
+        if tracking_device_status:
+            self._device_refresh_in_progress = False
+            if self.app_device_refresh_btn is not None:
+                can_refresh = APPIUM_AVAILABLE and parse_adb_devices is not None
+                state = "normal" if can_refresh else "disabled"
+                self.app_device_refresh_btn.config(state=state)
 
     # ------------------------------
     # App 模式：Appium 服务启动/停止控制（新控制台）
@@ -2717,11 +3450,7 @@ class DamaiGUI:
             self.appium_process = proc
             self.appium_pid = proc.pid
             self.appium_running = True
-            self.appium_status_var.set(f"Appium 运行中（PID {proc.pid}）")
-            try:
-                self.appium_toggle_btn.config(text="⏹ 停止 Appium")
-            except Exception:
-                pass
+            self._set_appium_display(f"Appium 运行中（PID {proc.pid}）", "⏹ 停止 Appium")
             self.log(f"✅ 已启动 Appium（新控制台，PID {proc.pid}）")
         except FileNotFoundError as exc:
             self.log(f"❌ 启动 Appium 失败：{exc}")
@@ -2748,13 +3477,15 @@ class DamaiGUI:
         try:
             result = subprocess.run(  # noqa: S603,S607
                 ["taskkill", "/T", "/F", "/PID", str(self.appium_pid)],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
             )
             if result.returncode == 0:
                 self.log(f"✅ 已停止 Appium（PID {self.appium_pid}）")
             else:
-                msg = (result.stderr or result.stdout or "").strip() or "未知错误"
+                # 成功信息直接丢弃；只在失败时才按系统编码解码错误输出用于提示
+                raw = result.stderr or b""
+                msg = raw.decode(locale.getpreferredencoding(False), errors="replace").strip() or "未知错误"
                 self.log(f"⚠️ 停止 Appium 返回码 {result.returncode}：{msg}")
         except Exception as exc:  # noqa: BLE001
             self.log(f"❌ 停止 Appium 失败：{exc}")
@@ -2768,36 +3499,50 @@ class DamaiGUI:
         self.appium_running = False
         self.appium_pid = None
         self.appium_process = None
-        self.appium_status_var.set("Appium 未运行")
-        try:
-            self.appium_toggle_btn.config(text="🚀 启动 Appium")
-        except Exception:
-            pass
-    
-    def _start_appium_status_check(self) -> None:
-        """启动 Appium 状态检测定时器"""
-        if self._appium_status_timer_id:
-            self.root.after_cancel(self._appium_status_timer_id)
-        self._appium_status_timer_id = self.root.after(self._appium_status_check_interval, self._check_appium_status)
+        self._set_appium_display("Appium 未运行", "🚀 启动 Appium")
     
     def _check_appium_status(self) -> None:
-        """检测 Appium 实际运行状态"""
+        """请求后台线程立即探测一次 Appium 运行状态（结果异步更新到按钮）。"""
+
+        self._appium_status_wake.set()
+
+    def _appium_status_loop(self) -> None:
+        """后台线程：周期性探测 Appium；连续探测失败时按指数退避拉长间隔，成功后立即恢复。"""
+
+        failures = 0
+        while True:
+            is_running = self._probe_appium_status()
+            self._post_to_ui(self._update_appium_button_state, is_running)
+            if is_running:
+                failures = 0
+                interval = _APPIUM_STATUS_INTERVAL_RUNNING
+            else:
+                interval = min(_APPIUM_STATUS_INTERVAL_MAX, _APPIUM_STATUS_INTERVAL_IDLE * 2 ** failures)
+                failures = min(failures + 1, 16)
+            # 用户触发的检测（_check_appium_status）会提前唤醒，不受退避影响
+            self._appium_status_wake.wait(interval)
+            self._appium_status_wake.clear()
+
+    def _probe_appium_status(self) -> bool:
+        # 先做一次 TCP 连接，端口未监听时无需发起 HTTP 请求
         try:
-            import requests
-            # 尝试连接 Appium 服务
-            response = requests.get("http://localhost:4723/status", timeout=1)
-            is_running = response.status_code == 200
-        except:
-            is_running = False
-        
-        # 更新状态
-        self._update_appium_button_state(is_running)
-        # 继续下一次检测
-        self._start_appium_status_check()
+            with socket.create_connection(
+                (_APPIUM_STATUS_HOST, _APPIUM_STATUS_PORT),
+                timeout=_APPIUM_CONNECT_TIMEOUT,
+            ):
+                pass
+        except OSError:
+            return False
+
+        try:
+            with urllib.request.urlopen(_APPIUM_STATUS_URL, timeout=_APPIUM_STATUS_HTTP_TIMEOUT) as response:
+                return response.status == 200
+        except Exception:  # noqa: BLE001
+            return False
     
     def _update_appium_button_state(self, is_running: bool) -> None:
         """根据 Appium 实际运行状态更新按钮状态"""
-        if not hasattr(self, "appium_toggle_btn") or not hasattr(self, "appium_status_var"):
+        if self.appium_toggle_btn is None:
             return
         
         # 如果状态没有变化，不需要更新
@@ -2809,20 +3554,31 @@ class DamaiGUI:
         
         # 更新按钮文本和状态信息
         if is_running:
-            self.appium_status_var.set("Appium 已运行")
-            try:
-                self.appium_toggle_btn.config(text="⏹ 停止 Appium")
-            except Exception:
-                pass
+            self._set_appium_display("Appium 已运行", "⏹ 停止 Appium")
         else:
-            self.appium_status_var.set("Appium 未运行")
+            self._set_appium_display("Appium 未运行", "🚀 启动 Appium")
+
+    def _set_appium_display(self, status: str, button_text: str) -> None:
+        """更新 Appium 状态文字与按钮文案；与当前显示一致时不触碰 Tk。"""
+
+        display = (status, button_text)
+        if display == self._last_appium_display:
+            return
+        self._last_appium_display = display
+        self.appium_status_var.set(status)
+        if self.appium_toggle_btn is not None:
             try:
-                self.appium_toggle_btn.config(text="🚀 启动 Appium")
+                self.appium_toggle_btn.config(text=button_text)
             except Exception:
                 pass
 
-    def _validate_app_server(self) -> Any:
+    def _validate_app_server(self, *, log: Optional[Callable[[str], None]] = None) -> Any:
         config = self._collect_app_config_from_form(strict=False)
+        return self._probe_app_server(config, log=log or self.log)
+
+    def _probe_app_server(self, config: Any, *, log: Callable[[str], None]) -> Any:
+        """探测 Appium /status；不读取 Tk 变量，可在后台线程调用。"""
+
         if config is None:
             error_detail = self._format_config_errors(self._last_config_errors)
             message = error_detail or "请先完善 App 配置后再检测服务"
@@ -2837,24 +3593,39 @@ class DamaiGUI:
         if not server_url:
             raise RuntimeError("Appium 服务地址不能为空")
 
-        status_url = f"{server_url}/status"
-
+        # 服务是否在线由 TCP 连接判定，端口未监听时毫秒级失败，无需等待 HTTP 超时
+        try:
+            parts = urllib.parse.urlsplit(server_url)
+            host = parts.hostname
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+        except ValueError as exc:
+            raise RuntimeError(f"Appium 服务地址无效: {exc}") from exc
+        if not host:
+            raise RuntimeError(f"Appium 服务地址无效: {server_url}")
         try:
-            import urllib.request
-            from urllib.error import URLError
+            with socket.create_connection((host, port), timeout=2):
+                pass
+        except OSError as exc:
+            raise RuntimeError(f"无法连接 Appium 服务: {exc}") from exc
 
+        # 端口已连通，/status 仅用于确认响应与输出诊断信息
+        status_url = f"{server_url}/status"
+        try:
             req = urllib.request.Request(status_url)
             with urllib.request.urlopen(req, timeout=5) as response:
                 if response.status != 200:
                     raise RuntimeError(f"状态码异常: {response.status}")
-                self.log("✅ Appium 服务响应正常")
-                device_name = caps.get("deviceName") if isinstance(caps, dict) else None
-                if device_name:
-                    self.log(f"📱 目标设备: {device_name}")
-        except URLError as exc:
-            raise RuntimeError(f"无法连接 Appium 服务: {exc}") from exc
+                log("✅ Appium 服务响应正常")
+        except HTTPError as exc:
+            raise RuntimeError(f"状态码异常: {exc.code}") from exc
+        except RuntimeError:
+            raise
         except Exception as exc:  # noqa: BLE001
-            raise RuntimeError(f"检测 Appium 服务失败: {exc}") from exc
+            log(f"⚠️ Appium 端口已连通，但 /status 未正常返回: {exc}")
+
+        device_name = caps.get("deviceName") if isinstance(caps, dict) else None
+        if device_name:
+            log(f"📱 目标设备: {device_name}")
 
         return config
 
@@ -2863,7 +3634,7 @@ class DamaiGUI:
         if var is None:
             return
         var.set(message)
-        if hasattr(self, "app_device_status_label"):
+        if self.app_device_status_label is not None:
             self.app_device_status_label.config(foreground=color)
 
     def _set_device_detail(self, message: str, *, color: Optional[str] = None) -> None:
@@ -2871,7 +3642,7 @@ class DamaiGUI:
         if var is None:
             return
         var.set(message)
-        if hasattr(self, "app_device_detail_label") and color is not None:
+        if self.app_device_detail_label is not None and color is not None:
             self.app_device_detail_label.config(foreground=color)
 
     def _reset_device_status_ui(self) -> None:
@@ -2888,7 +3659,7 @@ class DamaiGUI:
             self._set_device_status("无法检测设备", color="red")
             self._set_device_detail(hint, color="red")
 
-        if hasattr(self, "app_device_refresh_btn"):
+        if self.app_device_refresh_btn is not None:
             state = "normal" if can_refresh else "disabled"
             self.app_device_refresh_btn.config(state=state)
         if self.app_device_combobox is not None:
@@ -2897,7 +3668,7 @@ class DamaiGUI:
             self.app_device_combobox.config(state="disabled")
         if self.app_device_options_var is not None:
             self.app_device_options_var.set("")
-        self.app_detected_device_records = []
+        self._set_device_records([])
         self._device_refresh_in_progress = False
 
     def _refresh_devices_clicked(self) -> None:
@@ -2910,7 +3681,7 @@ class DamaiGUI:
             return
 
         self._device_refresh_in_progress = True
-        if hasattr(self, "app_device_refresh_btn"):
+        if self.app_device_refresh_btn is not None:
             self.app_device_refresh_btn.config(state="disabled")
 
         self._set_device_status("正在刷新设备列表...", color="blue")
@@ -2936,14 +3707,14 @@ class DamaiGUI:
                 self.mark_step("2. 设备检查", "error")
                 self.log("⚠️ Appium 服务正常，但未检测到可用设备，请检查 adb 连接或设备授权。")
             
-            if hasattr(self, "env_status_label"):
+            if self.env_status_label is not None:
                 self.env_status_label.config(text=status_text, foreground=status_color)
             
             self.app_env_ready = has_ready_device
             self._update_app_summary_from_form()
         finally:
             self._device_refresh_in_progress = False
-            if hasattr(self, "app_device_refresh_btn") and (APPIUM_AVAILABLE and parse_adb_devices is not None):
+            if self.app_device_refresh_btn is not None and (APPIUM_AVAILABLE and parse_adb_devices is not None):
                 self.app_device_refresh_btn.config(state="normal")
 
     def _update_device_status_from_result(self, has_ready_device: bool) -> None:
@@ -2953,12 +3724,11 @@ class DamaiGUI:
 
         combo = self.app_device_combobox
         if not self.app_detected_device_records and self.app_detected_devices:
-            self.app_detected_device_records = [
-                {"label": label, "serial": label}
-                for label in self.app_detected_devices
-            ]
+            self._set_device_records(
+                [DeviceRecord(label=label, serial=label) for label in self.app_detected_devices]
+            )
 
-        device_labels = [record.get("label", "") for record in self.app_detected_device_records]
+        device_labels = [record.label for record in self.app_detected_device_records]
 
         if has_ready_device and device_labels:
             device_count = len(device_labels)
@@ -2993,62 +3763,84 @@ class DamaiGUI:
             if self.app_device_options_var is not None:
                 self.app_device_options_var.set("")
 
-    def _format_detected_device_list(self, records: List[Dict[str, Any]]) -> str:
+    def _format_detected_device_list(self, records: List[DeviceRecord]) -> str:
+        is_current = records is self.app_detected_device_records
+        if is_current and self._device_list_str_cache is not None:
+            return self._device_list_str_cache
+
         lines: List[str] = []
         for idx, record in enumerate(records, start=1):
-            label = record.get("label") or record.get("serial") or "未知设备"
-            lines.append(f"{idx}. {label}")
-        return "\n".join(lines) or "设备已成功连接，可直接开始抢票。"
-
-    def _find_device_record_by_label(self, label: str) -> Optional[Dict[str, Any]]:
-        for record in self.app_detected_device_records:
-            if record.get("label") == label:
-                return record
-        return None
-
-    def _apply_device_record_to_form(self, record: Dict[str, Any]) -> None:
-        if not record:
+            lines.append(f"{idx}. {record.display_label}")
+        text = "\n".join(lines) or "设备已成功连接，可直接开始抢票。"
+        if is_current:
+            self._device_list_str_cache = text
+        return text
+
+    def _set_device_records(self, records: List[DeviceRecord]) -> None:
+        """替换设备记录列表并同步重建按标签的索引。"""
+
+        self.app_detected_device_records = records
+        # 标签重复时保留第一条，与原先线性查找的结果一致
+        index: Dict[str, DeviceRecord] = {}
+        for record in records:
+            index.setdefault(record.label, record)
+        self._device_records_by_label = index
+        self._device_list_str_cache = None
+        self._device_detail_cache = {}
+
+    def _find_device_record_by_label(self, label: str) -> Optional[DeviceRecord]:
+        return self._device_records_by_label.get(label)
+
+    def _apply_device_record_to_form(self, record: Optional[DeviceRecord]) -> None:
+        if record is None:
             return
 
-        device_name_value = record.get("model") or record.get("device") or record.get("serial") or ""
+        device_name_value = record.model or record.device or record.serial or ""
         if device_name_value:
             self.app_form_vars["device_name"].set(device_name_value)
 
-        serial = record.get("serial", "")
+        serial = record.serial
         if serial:
             self.app_form_vars["udid"].set(serial)
 
         if not self.app_form_vars["automation_name"].get().strip():
             self.app_form_vars["automation_name"].set("UiAutomator2")
 
-    def _build_device_detail_message(self, record: Dict[str, Any]) -> str:
+    def _build_device_detail_message(self, record: DeviceRecord) -> str:
+        cached = self._device_detail_cache.get(record.label)
+        if cached is not None and self._device_records_by_label.get(record.label) is record:
+            return cached
+
         lines: List[str] = []
-        primary_label = record.get("label") or record.get("serial") or "未知设备"
-        lines.append(f"当前选择：{primary_label}")
-        serial = record.get("serial")
+        lines.append(f"当前选择：{record.display_label}")
+        serial = record.serial
         if serial:
             lines.append(f"序列号：{serial}")
-        model = record.get("model")
+        model = record.model
         if model:
             lines.append(f"型号：{model}")
-        device_name = record.get("device")
+        device_name = record.device
         if device_name and device_name != model:
             lines.append(f"设备代号：{device_name}")
-        transport_id = record.get("transport_id")
+        transport_id = record.transport_id
         if transport_id:
             lines.append(f"Transport ID：{transport_id}")
         lines.append("已自动填充“设备名称”和“设备 UDID”字段。")
         lines.append("如需修改，可在下方表单中手动调整。")
 
         other_devices = [
-            other.get("label") or other.get("serial") or "未知设备"
+            other.display_label
             for other in self.app_detected_device_records
             if other is not record
         ]
         if other_devices:
             lines.append("其他设备：")
             lines.extend(f"• {label}" for label in other_devices)
-        return "\n".join(lines)
+        text = "\n".join(lines)
+        # 只缓存当前设备列表中的记录，文案里的“其他设备”依赖这份列表
+        if self._device_records_by_label.get(record.label) is record:
+            self._device_detail_cache[record.label] = text
+        return text
 
     def _on_device_selection_changed(self, event: Optional[Any] = None) -> None:
         if self.app_device_options_var is None:
@@ -3067,46 +3859,58 @@ class DamaiGUI:
         self._set_device_detail(detail_message, color="green")
 
         if event is not None:
-            display_label = record.get("label") or record.get("serial") or "未知设备"
-            self.log(f"ℹ️ 已应用设备：{display_label}")
+            self.log(f"ℹ️ 已应用设备：{record.display_label}")
+
+    def _detect_connected_devices(self, *, log: Optional[Callable[[str], None]] = None) -> bool:
+        """Run ``adb devices -l`` and record any connected Android devices (Tk thread only)."""
 
-    def _detect_connected_devices(self) -> bool:
-        """Run ``adb devices -l`` and record any connected Android devices."""
+        labels, records = self._scan_connected_devices(log=log or self.log)
+        self._apply_detected_devices(labels, records)
+        return bool(labels)
 
-        self.app_detected_devices = []
-        self.app_detected_device_records = []
+    def _apply_detected_devices(self, labels: List[str], records: List[DeviceRecord]) -> None:
+        """主线程：替换已检测到的设备列表，并重建依赖它的索引与文本缓存。"""
+
+        self.app_detected_devices = labels
+        self._set_device_records(records)
+
+    def _scan_connected_devices(
+        self, *, log: Callable[[str], None]
+    ) -> Tuple[List[str], List[DeviceRecord]]:
+        """执行 ``adb devices -l`` 并返回可用设备的 (标签, 记录)；不修改界面状态，可在后台线程调用。"""
 
         if parse_adb_devices is None:
-            return False
+            return [], []
 
         adb_command = ["adb", "devices", "-l"]
         try:
             result = subprocess.run(  # noqa: S603,S607 - 受控命令
                 adb_command,
                 capture_output=True,
-                text=True,
+                encoding="utf-8",
+                errors="replace",
                 timeout=5,
             )
         except FileNotFoundError:
-            self.log("⚠️ 未找到 adb 命令，请安装 Android SDK 平台工具并配置到 PATH。")
-            return False
+            log("⚠️ 未找到 adb 命令，请安装 Android SDK 平台工具并配置到 PATH。")
+            return [], []
         except Exception as exc:  # noqa: BLE001
-            self.log(f"⚠️ 执行 adb 命令失败: {exc}")
-            return False
+            log(f"⚠️ 执行 adb 命令失败: {exc}")
+            return [], []
 
         output = (result.stdout or "").strip()
         if result.returncode != 0:
             message = (result.stderr or "").strip() or output or "未知错误"
-            self.log(f"⚠️ adb 命令执行失败: {message}")
-            return False
+            log(f"⚠️ adb 命令执行失败: {message}")
+            return [], []
 
         devices = parse_adb_devices(output)
         if not devices:
-            self.log("⚠️ adb 未检测到任何设备，请确认设备已连接并授权 USB 调试。")
-            return False
+            log("⚠️ adb 未检测到任何设备，请确认设备已连接并授权 USB 调试。")
+            return [], []
 
         ready_devices: List[str] = []
-        ready_records: List[Dict[str, Any]] = []
+        ready_records: List[DeviceRecord] = []
         for device in devices:
             try:
                 label = device.describe()
@@ -3115,65 +3919,94 @@ class DamaiGUI:
 
             if device.is_ready:
                 ready_devices.append(label)
-                self.log(f"✅ 检测到设备: {label}")
+                log(f"✅ 检测到设备: {label}")
+                props = device.properties
                 ready_records.append(
-                    {
-                        "label": label,
-                        "serial": device.serial,
-                        "model": device.properties.get("model"),
-                        "device": device.properties.get("device"),
-                        "transport_id": device.properties.get("transport_id"),
-                        "properties": dict(device.properties),
-                        "info": device,
-                    }
+                    DeviceRecord(
+                        label=label,
+                        serial=device.serial,
+                        model=props.get("model"),
+                        device=props.get("device"),
+                        transport_id=props.get("transport_id"),
+                        properties=props,
+                        info=device,
+                    )
                 )
             else:
-                self.log(f"⚠️ 设备状态 {device.status}: {label}")
-
-        self.app_detected_devices = ready_devices
-        self.app_detected_device_records = ready_records
+                log(f"⚠️ 设备状态 {device.status}: {label}")
 
         if ready_devices:
-            self.log(f"✅ 共检测到 {len(ready_devices)} 台处于可用状态的设备。")
+            log(f"✅ 共检测到 {len(ready_devices)} 台处于可用状态的设备。")
         else:
-            self.log("⚠️ 设备已被识别，但尚未进入 device 状态，请确认已授权 USB 调试。")
+            log("⚠️ 设备已被识别，但尚未进入 device 状态，请确认已授权 USB 调试。")
 
-        return bool(ready_devices)
+        return ready_devices, ready_records
 
         
     def _try_auto_login(self):
         """尝试自动登录"""
-        if os.path.exists(self.cookie_file):
+        if self._has_saved_login():
             self.log("🔍 发现已保存的登录信息，尝试自动登录...")
-            threading.Thread(target=self._auto_login_worker, daemon=True).start()
+            self._submit_web_task(self._auto_login_worker)
         else:
             self.log("ℹ️ 未发现保存的登录信息，请手动登录")
     
+    def _has_saved_login(self) -> bool:
+        """是否记录过登录成功（浏览器用户目录中有会话）或存在旧版 Cookie 文件"""
+        return _login_marker_path().exists() or os.path.exists(self.cookie_file)
+
+    @staticmethod
+    def _driver_alive(driver) -> bool:
+        """判断 chromedriver 进程是否仍在运行"""
+        try:
+            return driver.service.process.poll() is None
+        except AttributeError:
+            return False
+
+    def _get_or_create_driver(self):
+        """返回仍存活的共享浏览器，没有时新建一个"""
+        with self._driver_lock:
+            if self.driver is None or not self._driver_alive(self.driver):
+                self.driver = webdriver.Chrome(options=_web_chrome_options())
+            return self.driver
+
+    def _get_or_create_analysis_driver(self):
+        """返回仍存活的页面分析浏览器，没有时新建一个（无界面，不占用共享浏览器的用户目录）"""
+        with self._driver_lock:
+            if self._analysis_driver is None or not self._driver_alive(self._analysis_driver):
+                self._analysis_driver = webdriver.Chrome(options=_analysis_chrome_options())
+            return self._analysis_driver
+
+    def _prewarm_browser(self) -> None:
+        """勾选「预热浏览器」后提前启动共享浏览器，首次登录只需打开页面"""
+        if not self.prewarm_browser_var.get() or self.mode_var.get() != "web" or not SELENIUM_AVAILABLE:
+            return
+        if self.driver is not None:
+            return
+        self.log("🔥 正在后台预热浏览器...")
+        self._bg_pool.submit(self._prewarm_browser_worker)
+
+    def _prewarm_browser_worker(self) -> None:
+        try:
+            self._get_or_create_driver()
+        except Exception as exc:  # noqa: BLE001
+            self._post_to_ui(self.log, f"⚠️ 浏览器预热失败，将在使用时再启动: {exc}")
+
     def _auto_login_worker(self):
         """自动登录工作线程"""
         try:
-            # 创建临时driver用于测试登录状态
-            options = webdriver.ChromeOptions()
-            options.add_experimental_option("excludeSwitches", ['enable-automation'])
-            options.add_argument('--disable-blink-features=AutomationControlled')
+            # 优先复用已启动的浏览器，没有时再创建driver用于测试登录状态
+            self._get_or_create_driver()
             
-            temp_driver = webdriver.Chrome(options=options)
-            self.driver = temp_driver
-            
-            # 尝试加载cookies
+            # 尝试加载cookies；失败时保留浏览器供手动登录复用
             if self.load_cookies():
-                self.root.after(0, lambda: self.update_step(1, "completed"))  # 网页登录完成
-                self.root.after(0, lambda: self.log("🎉 自动登录成功！"))
+                self._post_to_ui(self.update_step, 1, "completed")  # 网页登录完成
+                self._post_to_ui(self.log, "🎉 自动登录成功！")
             else:
-                temp_driver.quit()
-                self.driver = None
-                self.root.after(0, lambda: self.log("⚠️ 自动登录失败，请手动登录"))
+                self._post_to_ui(self.log, "⚠️ 自动登录失败，请手动登录")
                 
         except Exception as e:
-            if 'temp_driver' in locals():
-                temp_driver.quit()
-            self.driver = None
-            self.root.after(0, lambda: self.log(f"❌ 自动登录出错: {e}"))
+            self._post_to_ui(self.log, f"❌ 自动登录出错: {e}")
         
     def web_login(self):
         """网页登录功能"""
@@ -3184,19 +4017,17 @@ class DamaiGUI:
         if not url or url == "请输入大麦网演出详情页链接...":
             messagebox.showwarning("警告", "请先输入演出链接")
             return
+        if self._web_task_busy():
+            return
             
-        # 在新线程中执行登录
-        threading.Thread(target=self._web_login_worker, args=(url,), daemon=True).start()
+        # 在后台线程中执行登录
+        self._submit_web_task(self._web_login_worker, url)
         
     def _web_login_worker(self, url):
         """网页登录工作线程"""
         try:
-            # 初始化webdriver
-            options = webdriver.ChromeOptions()
-            options.add_experimental_option("excludeSwitches", ['enable-automation'])
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            
-            self.driver = webdriver.Chrome(options=options)
+            # 初始化webdriver（已有存活的浏览器时直接复用）
+            self._get_or_create_driver()
             self.log("✅ 浏览器启动成功")
             
             # 打开大麦网首页
@@ -3204,11 +4035,11 @@ class DamaiGUI:
             self.log("🌐 已打开大麦网，请在浏览器中完成登录")
             
             # 等待用户登录
-            self.root.after(0, self._show_login_instructions)
+            self._post_to_ui(self._show_login_instructions)
             
         except Exception as e:
-            self.root.after(0, lambda: self.log(f"❌ 网页登录失败: {e}"))
-            self.root.after(0, lambda: self.update_step(1, "error"))  # 网页登录是index=1
+            self._post_to_ui(self.log, f"❌ 网页登录失败: {e}")
+            self._post_to_ui(self.update_step, 1, "error")  # 网页登录是index=1
             
     def _show_login_instructions(self):
         """显示登录说明"""
@@ -3247,22 +4078,16 @@ class DamaiGUI:
         """登录完成"""
         window.destroy()
         
-        # 保存cookies
-        if self.save_cookies():
-            self.update_step(1, "completed")  # 网页登录是index=1
-            self.log("✅ 网页登录完成，登录状态已保存")
-            messagebox.showinfo("成功", "登录完成并已保存登录状态！下次启动将自动登录。")
-        else:
-            self.update_step(1, "completed")  # 网页登录是index=1
-            self.log("✅ 网页登录完成")
-            messagebox.showinfo("成功", "登录完成！现在可以输入演出链接进行分析。")
+        # 登录状态由浏览器用户目录持久保存，无需另行导出cookies
+        self._mark_login_saved()
+        self.update_step(1, "completed")  # 网页登录是index=1
+        self.log("✅ 网页登录完成，登录状态已保存")
+        messagebox.showinfo("成功", "登录完成并已保存登录状态！下次启动将自动登录。")
         
     def _login_cancelled(self, window):
         """取消登录"""
         window.destroy()
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        self._quit_driver()
         self.update_step(1, "inactive")  # 网页登录是index=1
         self.log("❌ 登录已取消")
         
@@ -3272,38 +4097,38 @@ class DamaiGUI:
         if not url or url == "请输入大麦网演出详情页链接...":
             messagebox.showwarning("警告", "请输入演出链接")
             return
+        if self._web_task_busy():
+            return
             
-        # 登录变为可选，不强制要求
-        if not self.driver:
-            self.log("ℹ️ 未检测到浏览器实例，将创建新的浏览器进行分析")
-            
+        # 登录变为可选，不强制要求；分析在后台无界面浏览器中进行
         self.update_step(2, "active")  # 页面分析是index=2
         self.log(f"🔍 开始分析页面: {url}")
         
-        # 在新线程中执行分析
-        threading.Thread(target=self._analyze_page_worker, args=(url,), daemon=True).start()
+        # 在后台线程中执行分析
+        self._submit_web_task(self._analyze_page_worker, url)
         
     def _analyze_page_worker(self, url):
         """页面分析工作线程"""
+        cached_info = _load_page_cache(url)
+        if cached_info is not None:
+            self.target_url = url
+            self._post_to_ui(self.log, "⚡ 使用最近的分析结果（缓存）")
+            self._post_to_ui(self._update_page_info, cached_info)
+            self._post_to_ui(self._create_config_interface, cached_info)
+            return
+
         try:
-            # 如果没有driver，创建一个临时的用于分析
-            temp_driver = None
-            if not self.driver:
-                self.root.after(0, lambda: self.log("🚀 创建临时浏览器进行页面分析..."))
-                options = webdriver.ChromeOptions()
-                options.add_experimental_option("excludeSwitches", ['enable-automation'])
-                options.add_argument('--disable-blink-features=AutomationControlled')
-                temp_driver = webdriver.Chrome(options=options)
-                analysis_driver = temp_driver
-            else:
-                analysis_driver = self.driver
+            # 分析使用单独的 eager 加载浏览器，不影响登录/抢票所用共享浏览器的加载策略
+            if self._analysis_driver is None:
+                self._post_to_ui(self.log, "🚀 启动后台浏览器进行页面分析...")
+            analysis_driver = self._get_or_create_analysis_driver()
             
             # 使用专用的页面分析器
             from gui_concert import PageAnalyzer
             
             analyzer = PageAnalyzer(
                 driver=analysis_driver,
-                log_callback=lambda msg: self.root.after(0, lambda: self.log(msg))
+                log_callback=self._log_from_thread
             )
             
             # 分析页面信息
@@ -3311,20 +4136,16 @@ class DamaiGUI:
             
             if page_info:
                 self.target_url = url
+                _store_page_cache(url, page_info)
                 # 更新UI
-                self.root.after(0, lambda: self._update_page_info(page_info))
-                self.root.after(0, lambda: self._create_config_interface(page_info))
+                self._post_to_ui(self._update_page_info, page_info)
+                self._post_to_ui(self._create_config_interface, page_info)
             else:
-                self.root.after(0, lambda: self.update_step(2, "error"))  # 页面分析是index=2
-            
-            # 如果使用了临时driver，关闭它
-            if temp_driver:
-                temp_driver.quit()
-                self.root.after(0, lambda: self.log("🗑️ 临时浏览器已关闭"))
+                self._post_to_ui(self.update_step, 2, "error")  # 页面分析是index=2
             
         except Exception as e:
-            self.root.after(0, lambda: self.log(f"❌ 页面分析失败: {e}"))
-            self.root.after(0, lambda: self.update_step(2, "error"))  # 页面分析是index=2
+            self._post_to_ui(self.log, f"❌ 页面分析失败: {e}")
+            self._post_to_ui(self.update_step, 2, "error")  # 页面分析是index=2
             
     def _update_page_info(self, info):
         """更新页面信息显示 - 改为在日志中显示关键信息"""
@@ -3347,42 +4168,47 @@ class DamaiGUI:
         self.update_step(2, "completed")  # 页面分析是index=2
         self.log("✅ 页面分析完成")
         
-        # 页面分析完成后自动保存cookies
-        self.save_cookies()
-        
     def _create_config_interface(self, info):
-        """创建配置界面"""
-        # 清除现有配置界面
-        for widget in self.config_label.master.winfo_children():
-            if widget != self.config_label:
-                widget.destroy()
-                
+        """创建配置界面；再次分析时复用已有控件，只更新候选项"""
+        if self._config_widgets is None:
+            self._build_config_widgets()
+
+        for key, var_name, _ in _WEB_CONFIG_CHOICES:
+            label, combo, var = self._config_widgets[key]
+            values = info[key]
+            if values:
+                # 候选项过多时改为可输入状态，通过输入文字过滤
+                combo.set_all_values(values)
+                combo.config(state="normal" if len(values) > combo.display_limit else "readonly")
+                var.set(values[0])
+                setattr(self, var_name, var)
+                label.grid()
+                combo.grid()
+            else:
+                # 本次页面没有该选择项，避免收集到上一次分析的旧值
+                setattr(self, var_name, None)
+                label.grid_remove()
+                combo.grid_remove()
+
+        self.update_step(3, "active")  # 参数配置是index=3
+
+    def _build_config_widgets(self) -> None:
+        """首次分析完成时创建配置面板控件"""
         self.config_label.config(text="")
         config_frame = self.config_label.master
         
-        # 城市选择
-        if info['cities']:
-            ttk.Label(config_frame, text="🏙️ 选择城市:", font=self.default_font).pack(anchor="w", pady=2)
-            self.city_var = tk.StringVar(value=info['cities'][0])
-            city_combo = ttk.Combobox(config_frame, textvariable=self.city_var, 
-                                     values=info['cities'], state="readonly", font=self.default_font)
-            city_combo.pack(fill="x", pady=2)
-            
-        # 日期选择
-        if info['dates']:
-            ttk.Label(config_frame, text="📅 选择日期:", font=self.default_font).pack(anchor="w", pady=2)
-            self.date_var = tk.StringVar(value=info['dates'][0])
-            date_combo = ttk.Combobox(config_frame, textvariable=self.date_var, 
-                                     values=info['dates'], state="readonly", font=self.default_font)
-            date_combo.pack(fill="x", pady=2)
-            
-        # 价格选择
-        if info['prices']:
-            ttk.Label(config_frame, text="💰 选择价格:", font=self.default_font).pack(anchor="w", pady=2)
-            self.price_var = tk.StringVar(value=info['prices'][0])
-            price_combo = ttk.Combobox(config_frame, textvariable=self.price_var, 
-                                      values=info['prices'], state="readonly", font=self.default_font)
-            price_combo.pack(fill="x", pady=2)
+        # 城市/日期/价格选择，没有候选项的一组通过 grid_remove 隐藏并保留位置
+        choices_frame = ttk.Frame(config_frame)
+        choices_frame.pack(fill="x")
+        choices_frame.columnconfigure(0, weight=1)
+        widgets: Dict[str, Tuple[ttk.Label, FilterCombobox, tk.StringVar]] = {}
+        for row, (key, _, text) in enumerate(_WEB_CONFIG_CHOICES):
+            label = ttk.Label(choices_frame, text=text, font=self.default_font)
+            label.grid(row=row * 2, column=0, sticky="w", pady=2)
+            var = tk.StringVar()
+            combo = FilterCombobox(choices_frame, textvariable=var, state="readonly", font=self.default_font)
+            combo.grid(row=row * 2 + 1, column=0, sticky="ew", pady=2)
+            widgets[key] = (label, combo, var)
             
         # 固定配置说明
         ttk.Label(config_frame, text="🎫 购买数量: 1张 (固定)", font=self.default_font).pack(anchor="w", pady=2)
@@ -3401,8 +4227,8 @@ class DamaiGUI:
         # 确认配置按钮
         ttk.Button(config_frame, text="✅ 确认配置", 
                   command=self._confirm_config).pack(pady=10)
-                  
-        self.update_step(3, "active")  # 参数配置是index=3
+
+        self._config_widgets = widgets
         
     def _confirm_config(self):
         """确认配置"""
@@ -3410,12 +4236,18 @@ class DamaiGUI:
             # 收集配置信息
             config = {}
             
-            if hasattr(self, 'city_var'):
-                config["city"] = self.city_var.get()
-            if hasattr(self, 'date_var'):
-                config["date"] = self.date_var.get()
-            if hasattr(self, 'price_var'):
-                config["price"] = self.price_var.get()
+            # 可输入的下拉框可能留有自由文本，只接受能对应到候选项的值
+            for key, var_name, text in _WEB_CONFIG_CHOICES:
+                var = getattr(self, var_name)
+                if var is None:
+                    continue
+                _, combo, _ = self._config_widgets[key]
+                value = combo.resolve(var.get())
+                if value is None:
+                    messagebox.showwarning("提示", f"{text.rstrip(':')}：「{var.get()}」不在可选项中，请从下拉列表中选择")
+                    return
+                var.set(value)
+                config[var_name[:-len("_var")]] = value
                 
             config["users"] = ["自动选择全部"]
             config["if_commit_order"] = self.commit_var.get()
@@ -3457,6 +4289,8 @@ class DamaiGUI:
         if not self.config:
             messagebox.showwarning("警告", "请先完成页面分析和参数配置")
             return
+        if self._web_task_busy():
+            return
 
         if not self.driver:
             result = messagebox.askyesno(
@@ -3473,9 +4307,10 @@ class DamaiGUI:
         self.start_btn.config(state="disabled")
         self.stop_btn.config(state="normal")
         self.is_grabbing = True
+        self._web_stop_event.clear()
         self.log("🎯 开始执行抢票...")
 
-        threading.Thread(target=self._grabbing_worker, daemon=True).start()
+        self._submit_web_task(self._grabbing_worker)
 
     def _start_app_grabbing(self) -> None:
         if not APPIUM_AVAILABLE or DamaiAppTicketRunner is None:
@@ -3492,6 +4327,7 @@ class DamaiGUI:
 
         try:
             config = self._collect_app_config_from_form()
+            device_configs = self._collect_app_device_configs()
         except Exception as exc:  # noqa: BLE001
             if ConfigValidationError is not None and isinstance(exc, ConfigValidationError):
                 errors = list(exc.errors)
@@ -3525,7 +4361,7 @@ class DamaiGUI:
 
         self.app_runner_thread = threading.Thread(
             target=self._run_app_runner,
-            args=(config, max_retries),
+            args=(device_configs, max_retries),
             daemon=True,
         )
         self.app_runner_thread.start()
@@ -3535,18 +4371,15 @@ class DamaiGUI:
         try:
             # 如果没有driver，创建一个并提示用户登录
             if not self.driver:
-                self.root.after(0, lambda: self.log("🚀 启动浏览器..."))
-                options = webdriver.ChromeOptions()
-                options.add_experimental_option("excludeSwitches", ['enable-automation'])
-                options.add_argument('--disable-blink-features=AutomationControlled')
-                self.driver = webdriver.Chrome(options=options)
+                self._post_to_ui(self.log, "🚀 启动浏览器...")
+                self._get_or_create_driver()
                 
                 # 打开大麦网让用户登录
                 self.driver.get("https://www.damai.cn")
-                self.root.after(0, lambda: self.log("🌐 已打开大麦网，请在浏览器中完成登录"))
+                self._post_to_ui(self.log, "🌐 已打开大麦网，请在浏览器中完成登录")
                 
                 # 弹出登录提示窗口
-                self.root.after(0, self._show_login_for_grabbing)
+                self._post_to_ui(self._show_login_for_grabbing)
                 return  # 等待用户确认登录后再继续
             
             # 使用GUI专用的抢票模块
@@ -3556,70 +4389,130 @@ class DamaiGUI:
             concert = GUIConcert(
                 driver=self.driver,
                 config=self.config,
-                log_callback=lambda msg: self.root.after(0, lambda: self.log(msg)),
-                cookie_callback=lambda: self.root.after(0, self.auto_save_cookies_if_needed),
-                stop_check=lambda: not self.is_grabbing  # 停止检查回调
+                log_callback=self._log_from_thread,
+                stop_event=self._web_stop_event  # 停止信号
             )
             
-            self.root.after(0, lambda: self.log("🎫 开始执行抢票流程..."))
+            self._post_to_ui(self.log, "🎫 开始执行抢票流程...")
             
             # 执行抢票
             concert.choose_ticket()
             
-            # 抢票完成后自动保存cookies
-            self.root.after(0, lambda: self.save_cookies())
-            
-            self.root.after(0, lambda: self.log("✅ 抢票流程执行完成"))
-            self.root.after(0, lambda: self.update_step(4, "completed"))  # 开始抢票是index=4
+            self._post_to_ui(self.log, "✅ 抢票流程执行完成")
+            self._post_to_ui(self.update_step, 4, "completed")  # 开始抢票是index=4
             
         except Exception as e:
-            self.root.after(0, lambda: self.log(f"❌ 抢票执行失败: {e}"))
-            self.root.after(0, lambda: self.update_step(4, "error"))      # 开始抢票是index=4
+            self._post_to_ui(self.log, f"❌ 抢票执行失败: {e}")
+            self._post_to_ui(self.update_step, 4, "error")      # 开始抢票是index=4
         finally:
             self.is_grabbing = False  # 重置抢票状态
-            self.root.after(0, lambda: self._reset_buttons())
+            self._post_to_ui(self._reset_buttons)
 
-    def _run_app_runner(self, config, max_retries: int) -> None:
-        """App 模式抢票线程"""
+    def _collect_app_device_configs(self) -> List[Tuple[Optional[str], Any]]:
+        """按配置文件的 devices 覆盖项为每台设备生成运行配置，返回 (日志标签, 配置) 列表。
 
-        def stop_signal() -> bool:
-            return self.app_should_stop
+        与命令行一致，首项为基础配置；未配置 devices 时只有一项且不带标签。
+        """
 
-        if DamaiAppTicketRunner is None:
-            self.root.after(0, lambda: self.log("❌ 当前环境未启用 Appium 运行器"))
+        configs = AppTicketConfig.from_mapping_multi(self._build_app_config_payload(strict=True))
+        if len(configs) == 1:
+            return [(None, configs[0])]
+        if len(configs) > _APP_MAX_PARALLEL_DEVICES:
+            self.log(
+                f"⚠️ 配置了 {len(configs)} 个设备会话，超过并行上限 {_APP_MAX_PARALLEL_DEVICES}，"
+                f"仅运行前 {_APP_MAX_PARALLEL_DEVICES} 个"
+            )
+            configs = configs[:_APP_MAX_PARALLEL_DEVICES]
+        return [
+            (str(config.device_caps.get("udid") or f"设备{index}"), config)
+            for index, config in enumerate(configs, start=1)
+        ]
+
+    def _run_app_runner(self, device_configs: List[Tuple[Optional[str], Any]], max_retries: int) -> None:
+        """App 模式抢票线程：每台设备一个独立子进程运行抢票流程，本线程转发其日志与结果。
+
+        多台设备并行时任一设备成功即通知其余进程停止。
+        """
+
+        if run_runner_process is None:
+            self._post_to_ui(self.log, "❌ 当前环境未启用 Appium 运行器")
             return
 
-        runner = None
-        try:
-            runner = DamaiAppTicketRunner(
-                config=config,
-                logger=self._app_runner_logger,
-                stop_signal=stop_signal,
-            )
-            success = runner.run(max_retries=max_retries)
-            report = runner.get_last_report()
-            stopped = self.app_should_stop
-            self.root.after(
-                0,
-                lambda s=success, st=stopped, r=report: self._handle_app_run_result(s, st, r),
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        stop_event = context.Event()
+        self._app_stop_event = stop_event
+        processes = [
+            context.Process(
+                target=run_runner_process,
+                args=(device_config, max_retries, stop_event, events, label),
+                name=f"damai-app-runner-{index}",
+                daemon=True,
             )
+            for index, (label, device_config) in enumerate(device_configs)
+        ]
+        if len(processes) > 1:
+            self._post_to_ui(self.log, f"🔀 将在 {len(processes)} 台设备上并行抢票，任一成功即停止其余设备")
+
+        success = False
+        stopped = False
+        final_report = None
+        error_message: Optional[str] = None
+        try:
+            for process in processes:
+                process.start()
+            pending = len(processes)
+            while pending:
+                try:
+                    event = events.get(timeout=0.2)
+                except queue.Empty:
+                    if any(process.is_alive() for process in processes):
+                        continue
+                    raise RuntimeError("抢票子进程意外退出")
+                kind = event[0]
+                if kind == "log":
+                    self._app_runner_logger(*event[1:])
+                    continue
+                pending -= 1
+                if kind == "result":
+                    _, ok, was_stopped, report = event
+                    if ok and not success:
+                        success = True
+                        final_report = report
+                        stop_event.set()  # 已有设备成功，通知其余设备停止
+                    elif not success:
+                        final_report = report if report is not None else final_report
+                        stopped = stopped or was_stopped
+                else:
+                    _, error_message, report = event
+                    if not success and final_report is None:
+                        final_report = report
+
+            if success or error_message is None:
+                self._post_to_ui(self._handle_app_run_result, success, stopped and not success, final_report)
+            else:
+                self._post_to_ui(self._handle_app_run_exception, RuntimeError(error_message), final_report)
         except Exception as exc:  # noqa: BLE001
-            report = runner.get_last_report() if runner is not None else None
-            self.root.after(
-                0,
-                lambda e=exc, r=report: self._handle_app_run_exception(e, r),
-            )
+            self._post_to_ui(self._handle_app_run_exception, exc, final_report)
         finally:
+            stop_event.set()
+            for process in processes:
+                if process.pid is None:  # 未能启动
+                    continue
+                process.join(timeout=2)
+                if process.is_alive():
+                    process.terminate()
+            self._app_stop_event = None
             self.is_grabbing = False
             self.app_runner_thread = None
             self.app_should_stop = False
-            self.root.after(0, lambda: self._reset_buttons())
+            self._post_to_ui(self._reset_buttons)
 
     def _run_preheated_app_runner(self, max_retries: int) -> None:
         """使用预热好的App模式抢票线程"""
 
-        if not hasattr(self, 'app_runner') or self.app_runner is None:
-            self.root.after(0, lambda: self.log("❌ 没有可用的预热运行器"))
+        if self.app_runner is None:
+            self._post_to_ui(self.log, "❌ 没有可用的预热运行器")
             return
 
         try:
@@ -3627,23 +4520,17 @@ class DamaiGUI:
             success = self.app_runner.run(max_retries=max_retries)
             report = self.app_runner.get_last_report()
             stopped = self.app_should_stop
-            self.root.after(
-                0,
-                lambda s=success, st=stopped, r=report: self._handle_app_run_result(s, st, r),
-            )
+            self._post_to_ui(self._handle_app_run_result, success, stopped, report)
         except Exception as exc:  # noqa: BLE001
             report = self.app_runner.get_last_report() if self.app_runner is not None else None
-            self.root.after(
-                0,
-                lambda e=exc, r=report: self._handle_app_run_exception(e, r),
-            )
+            self._post_to_ui(self._handle_app_run_exception, exc, report)
         finally:
             # 清理预热的runner
             self.app_runner = None
             self.is_grabbing = False
             self.app_runner_thread = None
             self.app_should_stop = False
-            self.root.after(0, lambda: self._reset_buttons())
+            self._post_to_ui(self._reset_buttons)
 
     def _handle_app_run_result(self, success: bool, stopped: bool, report: Optional[Any]) -> None:
         self.last_app_report = report
@@ -3688,25 +4575,9 @@ class DamaiGUI:
     def _app_runner_logger(self, level: str, message: str, context=None) -> None:
         """适配 App 运行器日志到 GUI"""
 
-        prefix = {
-            "step": "🧭",
-            "info": "ℹ️",
-            "success": "✅",
-            "warning": "⚠️",
-            "error": "❌",
-        }.get(level, "📄")
-
-        extra = ""
-        if context:
-            try:
-                extras = [f"{key}={value}" for key, value in context.items()]
-                if extras:
-                    extra = " (" + ", ".join(extras) + ")"
-            except Exception:
-                extra = ""
-
-        text = f"{prefix} {message}{extra}"
-        self.root.after(0, lambda: self.log(text))
+        prefix = _LEVEL_PREFIX.get(level, "📄")
+        extra = " (" + ", ".join(f"{key}={value}" for key, value in context.items()) + ")" if context else ""
+        self._post_to_ui(self.log, f"{prefix} {message}{extra}")
             
     def _show_login_for_grabbing(self):
         """显示抢票时的登录说明"""
@@ -3744,12 +4615,13 @@ class DamaiGUI:
         """登录后开始抢票"""
         window.destroy()
         
-        # 保存cookies
-        self.save_cookies()
-        
+        if self._web_task_busy():
+            self._reset_buttons()
+            return
         self.log("✅ 开始抢票流程...")
+        self._web_stop_event.clear()
         # 重新启动抢票worker
-        threading.Thread(target=self._grabbing_worker, daemon=True).start()
+        self._submit_web_task(self._grabbing_worker)
     
     def _cancel_grabbing_login(self, window):
         """取消抢票登录"""
@@ -3773,18 +4645,20 @@ class DamaiGUI:
             "确定要清除保存的登录状态吗？\n下次启动时需要重新登录。"
         )
         if result:
+            # 先退出浏览器释放用户目录，clear_cookies 才能删除整个目录
+            self._quit_driver()
             self.clear_cookies()
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
             self.update_step(1, "inactive")  # 重置登录状态
             messagebox.showinfo("完成", "登录状态已清除")
             
     def stop_grabbing(self):
         """停止抢票"""
         self.is_grabbing = False  # 设置停止标志
+        self._web_stop_event.set()
         if self.mode_var.get() == "app":
             self.app_should_stop = True
+            if self._app_stop_event is not None:
+                self._app_stop_event.set()
             self.log("⏹️ 正在请求停止 App 抢票...")
         else:
             self.log("⏹ 正在停止抢票...")
@@ -3793,8 +4667,11 @@ class DamaiGUI:
     def return_to_main(self):
         """回到主UI界面，保留用户配置"""
         self.is_grabbing = False
+        self._web_stop_event.set()
         if self.mode_var.get() == "app":
             self.app_should_stop = True
+            if self._app_stop_event is not None:
+                self._app_stop_event.set()
         
         # 重置运行统计
         self.app_metrics_var.set("尚未运行 App 抢票流程")
@@ -3815,69 +4692,23 @@ class DamaiGUI:
         self.log("🏠 已回到主界面，可以重新开始抢票")
         
     def show_help(self):
-        """显示帮助信息"""
+        """显示帮助信息；窗口首次打开时创建，关闭时仅隐藏，再次打开直接显示"""
+        if self._help_window is not None:
+            self._help_window.deiconify()
+            self._help_window.lift()
+            return
+
         help_window = tk.Toplevel(self.root)
         help_window.title("使用帮助")
         help_window.geometry("600x500")
         help_window.transient(self.root)
+        help_window.protocol("WM_DELETE_WINDOW", help_window.withdraw)
 
         help_text = scrolledtext.ScrolledText(help_window, wrap=tk.WORD, font=self.default_font)
         help_text.pack(fill="both", expand=True, padx=10, pady=10)
-
-        help_content = """
-🎫 大麦抢票工具使用说明
-
-🧭 模式概览：
-• 网页模式 (Web)：使用 Chrome + Selenium 自动化网页端购票流程
-• App 模式 (App)：通过 Appium 控制大麦 App，适合移动端极速抢票
-
-📋 网页模式流程：
-1. 环境检测 —— 检查 Python、Selenium 与 ChromeDriver 是否可用
-2. 网页登录 —— 可选，可提前登录或在抢票时登录，状态会自动保存
-3. 页面分析 —— 输入演出链接，自动解析城市、日期、价格等选项
-4. 参数配置 —— 在界面中选择目标条件并确认
-5. 开始抢票 —— 启动自动化流程，实时输出执行日志
-
-📱 App 模式流程：
-1. 环境检测 —— 校验 Python 环境与 Appium 客户端依赖
-2. 设备检查 —— 请求 Appium Server /status，确认服务与设备在线
-3. 参数配置 —— 选择或加载 config.jsonc/JSON，配置城市、价格、观演人
-4. 开始抢票 —— 运行移动端抢票流程，可设置重试次数
-5. 查看结果 —— 日志中查看 Appium 执行步骤与最终状态
-
-🔧 关键说明：
-
-网页模式：
-• 支持自动保存/加载登录 Cookie，减少重复登录
-• 页面分析无需登录即可完成，可先确认票务信息
-• 观演人自动全选，支持可选的自动提交订单
-
-App 模式前置条件：
-• 已安装 Appium Server 并保持运行 (默认 http://127.0.0.1:4723)
-• Android 设备已开启开发者模式并与电脑连接
-• damai_appium/config.jsonc 配置正确，包含 server_url、device_caps 等
-• 若设备未自动识别，请在配置中补充 deviceName、udid 等字段
-
-App 模式小贴士：
-• 先点击“重新加载”确认配置无误，再执行环境检测
-• 环境检测通过后按钮会自动解锁，可随时停止流程
-• 日志前缀：🧭步骤、ℹ️信息、✅成功、⚠️警告、❌异常，便于快速定位
-
-⚠️ 通用注意事项：
-• 确保网络与设备连接稳定
-• 抢票前检查实名信息、观演人等是否完善
-• 谨慎使用自动提交，建议保留人工确认
-• 遵守大麦网条款，合理合法地使用工具
-
-💡 使用技巧：
-• 新用户推荐通过“环境检测”了解依赖情况
-• 自动登录失败时，可清除登录状态后重新登录
-• 多场演出可分别分析并保存日志作为参考
-• 建议在开票前完成一次全流程演练
-"""
-
-        help_text.insert("1.0", help_content)
+        help_text.insert("1.0", _HELP_CONTENT)
         help_text.config(state="disabled")
+        self._help_window = help_window
 
 
     def _start_authz_watchdog(self) -> None:
@@ -3891,4 +4722,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -13,6 +13,35 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException,
 from selenium.webdriver.common.action_chains import ActionChains
 
 
+# 页面分析时在浏览器内一次性收集的信息：标题、场地、售票状态及各选择框（跳过禁用选项）
+_PAGE_INFO_SCRIPT = """
+const text = (selector) => {
+    const el = document.querySelector(selector);
+    return el ? el.innerText : null;
+};
+return {
+    title: text('.perform__order__title h1'),
+    venue: text('.perform__order__venue'),
+    status: text('.perform__order__price'),
+    selects: Array.from(document.querySelectorAll('.perform__order__select')).map((box) => {
+        const title = box.querySelector('.select_left');
+        return {
+            title: title ? title.innerText : '',
+            options: Array.from(box.querySelectorAll('.select_right .select_right_list_item'))
+                .filter((opt) => (opt.getAttribute('class') || '').indexOf('disabled') === -1)
+                .map((opt) => opt.innerText),
+        };
+    }),
+};
+"""
+# 页面分析只需要文本信息：分析期间屏蔽图片、字体与音视频请求（通配符匹配，兼容带参数的 CDN 地址）
+_ANALYSIS_BLOCKED_URLS = [
+    f"*.{ext}*"
+    for ext in ("png", "jpg", "jpeg", "gif", "webp", "svg", "ico",
+                "woff", "woff2", "ttf", "otf", "mp4", "webm", "m3u8")
+]
+
+
 class PageAnalyzer:
     """页面分析器 - 专门用于分析大麦网演出页面信息"""
     
@@ -20,8 +49,18 @@ class PageAnalyzer:
         self.driver = driver
         self.log = log_callback or (lambda x: print(x))
     
+    def _set_blocked_urls(self, urls):
+        """通过 CDP 设置浏览器屏蔽的请求地址，非 Chromium 驱动时静默跳过"""
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        except Exception:
+            pass
+
     def analyze_show_page(self, url):
         """分析演出页面，提取城市、日期、价格等信息"""
+        # 传入的浏览器可能还要用于登录/抢票（验证码需要图片），因此只在分析期间屏蔽
+        self._set_blocked_urls(_ANALYSIS_BLOCKED_URLS)
         try:
             self.log(f"🔍 正在访问页面: {url}")
             self.driver.get(url)
@@ -31,11 +70,8 @@ class PageAnalyzer:
                 EC.presence_of_element_located((By.CLASS_NAME, "perform__order__select"))
             )
             
-            # 提取演出基本信息
-            page_info = self._extract_basic_info()
-            
-            # 提取选择项信息
-            page_info.update(self._extract_selection_options())
+            # 提取演出基本信息与选择项信息
+            page_info = self._extract_page_info()
             
             self.log(f"✅ 页面分析完成，找到 {len(page_info.get('cities', []))} 个城市，{len(page_info.get('dates', []))} 个日期，{len(page_info.get('prices', []))} 个价格")
             
@@ -44,9 +80,11 @@ class PageAnalyzer:
         except Exception as e:
             self.log(f"❌ 页面分析失败: {e}")
             return None
+        finally:
+            self._set_blocked_urls([])
     
-    def _extract_basic_info(self):
-        """提取基本信息"""
+    def _extract_page_info(self):
+        """一次 execute_script 读取基本信息与全部选择项，避免逐个元素往返 WebDriver"""
         info = {
             "title": "未知演出",
             "venue": "未知场地", 
@@ -57,84 +95,49 @@ class PageAnalyzer:
         }
         
         try:
-            # 演出标题
-            title_elem = self.driver.find_element(By.CSS_SELECTOR, ".perform__order__title h1")
-            info["title"] = title_elem.text.strip()
-        except:
-            pass
-            
-        try:
-            # 演出场地
-            venue_elem = self.driver.find_element(By.CSS_SELECTOR, ".perform__order__venue")
-            info["venue"] = venue_elem.text.strip()
-        except:
-            pass
-            
-        try:
-            # 售票状态
-            status_elem = self.driver.find_element(By.CSS_SELECTOR, ".perform__order__price")
-            info["status"] = status_elem.text.strip()
-        except:
-            pass
-            
-        return info
-    
-    def _extract_selection_options(self):
-        """提取选择项（城市、日期、价格）"""
-        options = {
-            "cities": [],
-            "dates": [],
-            "prices": []
-        }
-        
-        try:
-            # 查找所有选择框
-            select_boxes = self.driver.find_elements(By.CSS_SELECTOR, ".perform__order__select")
-            
-            for box in select_boxes:
-                try:
-                    # 获取选择框标题来判断类型
-                    title_elem = box.find_element(By.CSS_SELECTOR, ".select_left")
-                    title = title_elem.text.strip()
-                    
-                    # 获取选项列表
-                    option_elems = box.find_elements(By.CSS_SELECTOR, ".select_right .select_right_list_item")
-                    option_texts = []
-                    
-                    for opt in option_elems:
-                        # 跳过禁用的选项
-                        if "disabled" in opt.get_attribute("class"):
-                            continue
-                        text = opt.text.strip()
-                        if text:
-                            option_texts.append(text)
-                    
-                    # 根据标题判断选项类型
-                    if "城市" in title or "地区" in title:
-                        options["cities"] = option_texts
-                    elif "日期" in title or "时间" in title or "场次" in title:
-                        options["dates"] = option_texts
-                    elif "价格" in title or "票档" in title:
-                        options["prices"] = option_texts
-                        
-                except Exception as e:
-                    continue
-                    
+            raw = self.driver.execute_script(_PAGE_INFO_SCRIPT) or {}
         except Exception as e:
-            self.log(f"⚠️ 选择项提取部分失败: {e}")
+            self.log(f"⚠️ 页面信息提取失败: {e}")
+            return info
+
+        for key in ("title", "venue", "status"):
+            if raw.get(key) is not None:
+                info[key] = raw[key].strip()
+
+        for box in raw.get("selects") or []:
+            # 根据标题判断选项类型
+            title = (box.get("title") or "").strip()
+            option_texts = [text.strip() for text in box.get("options") or [] if text.strip()]
+            if "城市" in title or "地区" in title:
+                info["cities"] = option_texts
+            elif "日期" in title or "时间" in title or "场次" in title:
+                info["dates"] = option_texts
+            elif "价格" in title or "票档" in title:
+                info["prices"] = option_texts
             
-        return options
+        return info
 
 
 class GUIConcert:
     """GUI专用的抢票类"""
     
-    def __init__(self, driver, config, log_callback=None, cookie_callback=None, stop_check=None):
+    def __init__(self, driver, config, log_callback=None, stop_check=None, stop_event=None):
         self.driver = driver
         self.config = config
         self.log = log_callback or (lambda x: print(x))
-        self.save_cookie = cookie_callback or (lambda: None)  # Cookie保存回调
-        self.should_stop = stop_check or (lambda: False)  # 停止检查回调
+        # 停止信号：优先使用 threading.Event，停止时可立即唤醒循环中的等待
+        self.stop_event = stop_event
+        if stop_event is not None:
+            self.should_stop = stop_event.is_set
+        else:
+            self.should_stop = stop_check or (lambda: False)  # 停止检查回调
+
+    def _sleep(self, seconds):
+        """循环等待；传入 stop_event 时收到停止信号立即返回"""
+        if self.stop_event is not None:
+            self.stop_event.wait(seconds)
+        else:
+            time.sleep(seconds)
         
     def choose_ticket(self):
         """执行完整的抢票流程（带循环等待）"""
@@ -143,9 +146,6 @@ class GUIConcert:
             self.log(f"🎯 前往演出页面: {self.config['target_url']}")
             self.driver.get(self.config['target_url'])
             
-            # 页面加载后保存cookie
-            self.save_cookie()
-            
             # 等待页面加载
             self._wait_for_page_load()
             
@@ -189,12 +189,12 @@ class GUIConcert:
                     
                 elif button_status == "not_started":
                     self.log("⏳ 抢票未开始，等待中...")
-                    time.sleep(2)  # 等待2秒后重试
+                    self._sleep(2)  # 等待2秒后重试
                     
                 elif button_status == "sold_out":
                     if self.config.get('if_listen', False):
                         self.log("📋 已售罄，启用回流监听...")
-                        time.sleep(5)  # 回流监听间隔稍长
+                        self._sleep(5)  # 回流监听间隔稍长
                     else:
                         self.log("❌ 已售罄且未启用回流监听")
                         break
@@ -202,18 +202,18 @@ class GUIConcert:
                 else:
                     self.log("🔄 未知状态，刷新页面重试...")
                     self.driver.refresh()
-                    time.sleep(3)
+                    self._sleep(3)
                     
                 # 每隔一定次数刷新页面，防止页面超时
                 if loop_count % 10 == 0:
                     self.log("🔄 定期刷新页面...")
                     self.driver.refresh()
-                    time.sleep(2)
+                    self._sleep(2)
                     self._wait_for_page_load()
                     
             except Exception as e:
                 self.log(f"⚠️ 循环中出现异常: {e}")
-                time.sleep(1)
+                self._sleep(1)
                 continue
                 
         if self.should_stop():
@@ -0,0 +1,109 @@
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import damai_gui
+
+
+@pytest.fixture
+def host():
+    return SimpleNamespace(_app_config_cache={})
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    """统计实际解析配置的次数"""
+    calls = []
+    original = damai_gui.AppTicketConfig.from_mapping
+
+    def counting_from_mapping(payload):
+        calls.append(payload)
+        return original(payload)
+
+    monkeypatch.setattr(damai_gui.AppTicketConfig, "from_mapping", counting_from_mapping)
+    return calls
+
+
+def _write_config(path, payload, *, mtime_ns):
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def _load(host, path):
+    return damai_gui.DamaiGUI._load_app_config_cached(host, path)
+
+
+def test_cache_hit_reuses_parsed_config(host, parse_calls, tmp_path):
+    path = tmp_path / "config.json"
+    _write_config(
+        path,
+        {"server_url": "127.0.0.1:4723", "city": "北京", "devices": [{"device_caps": {"udid": "second"}}]},
+        mtime_ns=1_700_000_000_000_000_000,
+    )
+
+    first = _load(host, path)
+    second = _load(host, path)
+
+    assert second[0] is first[0]
+    assert len(parse_calls) == 1
+    config, overrides = first
+    assert config.city == "北京"
+    assert overrides == [{"device_caps": {"udid": "second"}}]
+
+
+def test_cache_invalidated_when_mtime_changes(host, parse_calls, tmp_path):
+    path = tmp_path / "config.json"
+    _write_config(path, {"server_url": "127.0.0.1:4723", "city": "北京"}, mtime_ns=1_700_000_000_000_000_000)
+    _load(host, path)
+
+    # 内容长度不变，只有 mtime 不同
+    _write_config(path, {"server_url": "127.0.0.1:4723", "city": "上海"}, mtime_ns=1_700_000_001_000_000_000)
+    config, _ = _load(host, path)
+
+    assert config.city == "上海"
+    assert len(parse_calls) == 2
+
+
+def test_cache_invalidated_when_size_changes(host, parse_calls, tmp_path):
+    path = tmp_path / "config.json"
+    mtime_ns = 1_700_000_000_000_000_000
+    _write_config(path, {"server_url": "127.0.0.1:4723", "city": "北京"}, mtime_ns=mtime_ns)
+    _load(host, path)
+
+    _write_config(path, {"server_url": "127.0.0.1:4723", "city": "呼和浩特"}, mtime_ns=mtime_ns)
+    config, _ = _load(host, path)
+
+    assert config.city == "呼和浩特"
+    assert len(parse_calls) == 2
+
+
+def test_stale_keys_for_same_path_are_evicted(host, tmp_path):
+    path = tmp_path / "config.json"
+    other = tmp_path / "other.json"
+    _write_config(other, {"server_url": "127.0.0.1:4723"}, mtime_ns=1_700_000_000_000_000_000)
+    _load(host, other)
+    for index in range(3):
+        _write_config(
+            path,
+            {"server_url": "127.0.0.1:4723", "city": f"城市{index}"},
+            mtime_ns=1_700_000_000_000_000_000 + index * 1_000_000_000,
+        )
+        _load(host, path)
+
+    paths = [key[0] for key in host._app_config_cache]
+    assert sorted(paths) == sorted([str(path), str(other)])
+    (config, _), = [value for key, value in host._app_config_cache.items() if key[0] == str(path)]
+    assert config.city == "城市2"
+
+
+def test_validation_error_names_the_file(host, tmp_path):
+    path = tmp_path / "broken.json"
+    _write_config(path, {"server_url": ""}, mtime_ns=1_700_000_000_000_000_000)
+
+    with pytest.raises(damai_gui.ConfigValidationError) as excinfo:
+        _load(host, path)
+
+    assert "broken.json" in excinfo.value.message
+    assert host._app_config_cache == {}
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import damai_gui
+
+
+def _device_config_host(payload):
+    logs = []
+    host = SimpleNamespace(
+        _build_app_config_payload=lambda *, strict: payload,
+        log=logs.append,
+    )
+    return host, logs
+
+
+def test_collect_app_device_configs_without_devices():
+    host, logs = _device_config_host({"server_url": "127.0.0.1:4723", "device_caps": {"udid": "base"}})
+
+    configs = damai_gui.DamaiGUI._collect_app_device_configs(host)
+
+    assert [label for label, _ in configs] == [None]
+    assert configs[0][1].device_caps["udid"] == "base"
+    assert logs == []
+
+
+def test_collect_app_device_configs_applies_overrides():
+    payload = {
+        "server_url": "127.0.0.1:4723",
+        "city": "北京",
+        "device_caps": {"udid": "base", "deviceName": "Pixel"},
+        "devices": [
+            {"device_caps": {"udid": "second"}, "city": "上海"},
+            {"device_caps": {}},
+        ],
+    }
+    host, logs = _device_config_host(payload)
+
+    configs = damai_gui.DamaiGUI._collect_app_device_configs(host)
+
+    assert [label for label, _ in configs] == ["base", "second", "base"]
+    assert [config.city for _, config in configs] == ["北京", "上海", "北京"]
+    assert configs[1][1].device_caps == {"udid": "second", "deviceName": "Pixel"}
+    assert logs == []
+
+
+def test_collect_app_device_configs_warns_when_truncating(monkeypatch):
+    monkeypatch.setattr(damai_gui, "_APP_MAX_PARALLEL_DEVICES", 2)
+    payload = {
+        "server_url": "127.0.0.1:4723",
+        "device_caps": {"udid": "d0"},
+        "devices": [{"device_caps": {"udid": f"d{index}"}} for index in range(1, 4)],
+    }
+    host, logs = _device_config_host(payload)
+
+    configs = damai_gui.DamaiGUI._collect_app_device_configs(host)
+
+    assert [label for label, _ in configs] == ["d0", "d1"]
+    assert len(logs) == 1 and "4" in logs[0]
@@ -0,0 +1,44 @@
+from damai_appium.config import parse_adb_devices
+
+
+def test_parse_adb_devices_with_properties():
+    output = (
+        "* daemon not running; starting now at tcp:5037\n"
+        "* daemon started successfully\n"
+        "List of devices attached\n"
+        "emulator-5554          device product:sdk_gphone64 model:sdk_gphone64 device:emu64a transport_id:1\n"
+        "R58M12345AB\tunauthorized usb:1-1 transport_id:2\n"
+        "\n"
+    )
+
+    devices = parse_adb_devices(output)
+
+    assert [(item.serial, item.status) for item in devices] == [
+        ("emulator-5554", "device"),
+        ("R58M12345AB", "unauthorized"),
+    ]
+    assert devices[0].properties == {
+        "product": "sdk_gphone64",
+        "model": "sdk_gphone64",
+        "device": "emu64a",
+        "transport_id": "1",
+    }
+    assert devices[0].is_ready
+    assert not devices[1].is_ready
+    assert devices[0].describe() == "emulator-5554 (sdk_gphone64, emu64a, transport:1)"
+
+
+def test_parse_adb_devices_plain_listing():
+    output = "List of devices attached\r\n192.168.1.8:5555\tdevice\r\nlonely\r\n"
+
+    devices = parse_adb_devices(output)
+
+    assert [(item.serial, item.status, item.properties) for item in devices] == [
+        ("192.168.1.8:5555", "device", {}),
+        ("lonely", "unknown", {}),
+    ]
+
+
+def test_parse_adb_devices_empty_output():
+    assert parse_adb_devices("") == []
+    assert parse_adb_devices("List of devices attached\n\n") == []
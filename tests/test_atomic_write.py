@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+import damai_gui
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    """分别在 orjson 与标准库 json 两种序列化后端下运行"""
+    if request.param == "orjson":
+        if damai_gui.orjson is None:
+            pytest.skip("orjson 未安装")
+    else:
+        monkeypatch.setattr(damai_gui, "orjson", None)
+    return request.param
+
+
+def test_write_json_atomic_replaces_file(json_backend, tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text("旧内容", encoding="utf-8")
+    payload = {"server_url": "http://127.0.0.1:4723", "users": ["张三"], "devices": []}
+
+    damai_gui._write_json_atomic(path, payload)
+
+    assert json.loads(path.read_bytes()) == payload
+    assert "张三" in path.read_text(encoding="utf-8")
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_write_json_atomic_leaves_target_when_write_fails(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_bytes(b"original")
+
+    def failing_write(fd, data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(damai_gui.os, "write", failing_write)
+    with pytest.raises(OSError):
+        damai_gui._write_json_atomic(path, {"server_url": "http://127.0.0.1:4723"})
+
+    assert path.read_bytes() == b"original"
+
+
+def test_write_bytes_atomic_keeps_bytes_verbatim(tmp_path):
+    path = tmp_path / "damai_cookies.pkl"
+    payload = bytes(range(256)) * 4 + b"\r\n\n"
+
+    damai_gui._write_bytes_atomic(path, payload)
+
+    assert path.read_bytes() == payload
+    assert not path.with_suffix(".pkl.tmp").exists()
@@ -0,0 +1,61 @@
+import tkinter as tk
+
+import pytest
+
+from comment.filter_combobox import FilterCombobox
+
+
+@pytest.fixture(scope="module")
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        pytest.skip(f"无可用的图形界面: {exc}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def combo(root):
+    values = [f"{city} 站" for city in ("北京", "上海", "广州", "深圳")] + ["Shanghai Arena"]
+    widget = FilterCombobox(root, all_values=values, display_limit=3)
+    yield widget
+    widget.destroy()
+
+
+def _type(combo, text):
+    combo.set(text)
+    combo.event_generate("<KeyRelease>", keysym="a")
+    combo.update()
+
+
+def test_display_limit_caps_initial_values(combo):
+    assert list(combo["values"]) == ["北京 站", "上海 站", "广州 站"]
+
+
+def test_typing_filters_all_values_case_insensitively(combo):
+    _type(combo, "shang")
+    assert list(combo["values"]) == ["Shanghai Arena"]
+
+    _type(combo, "站")
+    assert list(combo["values"]) == ["北京 站", "上海 站", "广州 站"]
+
+    _type(combo, "  ")
+    assert list(combo["values"]) == ["北京 站", "上海 站", "广州 站"]
+
+
+def test_resolve_accepts_exact_or_single_match(combo):
+    assert combo.resolve("深圳 站") == "深圳 站"
+    assert combo.resolve("深圳") == "深圳 站"
+    assert combo.resolve("ARENA") == "Shanghai Arena"
+    assert combo.resolve("站") is None
+    assert combo.resolve("成都") is None
+    assert combo.resolve("") is None
+
+
+def test_set_all_values_replaces_candidates(combo):
+    combo.set_all_values(["A", "B"])
+
+    assert list(combo["values"]) == ["A", "B"]
+    assert combo.resolve("北京") is None
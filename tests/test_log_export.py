@@ -0,0 +1,67 @@
+import io
+import json
+
+import pytest
+
+import damai_gui
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def json_backend(request, monkeypatch):
+    """分别在 orjson 与标准库 json 两种序列化后端下运行"""
+    if request.param == "orjson":
+        if damai_gui.orjson is None:
+            pytest.skip("orjson 未安装")
+    else:
+        monkeypatch.setattr(damai_gui, "orjson", None)
+    return request.param
+
+
+REPORT = {
+    "success": False,
+    "final_phase": "order_confirm",
+    "metrics": {"attempts": 3, "duration": 12.5},
+    "logs": [{"level": "step", "message": "进入详情页", "context": {"retry": 1}}],
+}
+
+ENTRIES = [
+    ("12:00:00", "✅ 已加载 App 配置: config.jsonc", "success"),
+    ("12:00:01", 'quote " and \\ backslash\n第二行', "info"),
+    ("12:00:02", "⚠️ 未检测到可用设备", "warning"),
+]
+
+
+def _export(header, entries):
+    fp = io.BytesIO()
+    damai_gui._stream_log_export(fp, header, damai_gui._log_export_entries(entries))
+    return json.loads(fp.getvalue())
+
+
+def _objects(entries):
+    return [{"timestamp": ts, "message": message, "level": level} for ts, message, level in entries]
+
+
+@pytest.mark.parametrize("report", [REPORT, None])
+def test_export_round_trips_production_header(json_backend, report):
+    header = damai_gui._log_export_header(report)
+
+    document = _export(header, iter(ENTRIES))
+
+    assert list(document) == ["exported_at", "app_run_report", "log_entries"]
+    assert document["app_run_report"] == report
+    assert document["log_entries"] == _objects(ENTRIES)
+
+
+def test_export_without_entries(json_backend):
+    document = _export(damai_gui._log_export_header(None), [])
+
+    assert document["log_entries"] == []
+
+
+def test_export_across_batches(json_backend, monkeypatch):
+    monkeypatch.setattr(damai_gui, "_LOG_EXPORT_BATCH", 3)
+    entries = [(f"12:00:{index:02d}", f"line {index}", "info") for index in range(10)]
+
+    document = _export(damai_gui._log_export_header(REPORT), iter(entries))
+
+    assert document["log_entries"] == _objects(entries)
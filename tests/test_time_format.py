@@ -0,0 +1,18 @@
+import pytest
+
+import damai_gui
+
+
+@pytest.mark.parametrize(
+    ("seconds", "expected"),
+    [
+        (0, "00:00:00"),
+        (59, "00:00:59"),
+        (3661, "01:01:01"),
+        (86399, "23:59:59"),
+        (86400, "24:00:00"),
+        (3 * 86400 + 3725, "73:02:05"),
+    ],
+)
+def test_fmt_hms(seconds, expected):
+    assert damai_gui._fmt_hms(seconds) == expected